@@ -0,0 +1,133 @@
+"""
+Micro-benchmark of the line oriented metadata parser (extensions/metadata_parser.py)
+against the previous regex + yaml.safe_load implementation, on synthetic files
+using all three metadata syntaxes.
+
+Usage: python benchmarks/bench_metadata_parser.py [--files 2000] [--repeat 5]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+
+import yaml
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'extensions'))
+
+from metadata_parser import read_metadata_block, RST_DIRECTIVE, FRONT_MATTER, FENCE
+
+BODY = "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n" * 200
+
+def legacy_rst_fields(filepath: str):
+    """The regex + YAML implementation extract_rst_metadata used before the streaming parser."""
+    metadata_yaml_pattern = re.compile(
+        r'^\.\.\s*metadata::\s*\n'
+        r'(.*?)'
+        r'(?=\n\S|\Z)',
+        re.DOTALL | re.MULTILINE
+    )
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        head_content = f.read(1000)
+
+    yaml_match = metadata_yaml_pattern.search(head_content)
+    if not yaml_match:
+        return None
+
+    yaml_content = yaml_match.group(1)
+    first_line = [line for line in yaml_content.splitlines() if line.strip()][0]
+    indent = len(first_line) - len(first_line.lstrip())
+
+    unindented_content = re.sub(r'^\s{' + str(indent) + '}', '', yaml_content, flags=re.MULTILINE)
+    data = yaml.safe_load(unindented_content) or {}
+    return {key.lstrip(':'): value for key, value in data.items()}
+
+def legacy_md_fields(filepath: str):
+    """The regex + YAML implementation extract_md_metadata used before the streaming parser."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read(1000)
+
+    yaml_match = re.match(r'---\s*\n(.*?)\n---', content, re.DOTALL)
+    if not yaml_match:
+        match = re.compile(r'```{metadata}\s*\n(.*?)\n```', re.DOTALL | re.MULTILINE).search(content)
+        match_content = match.group(1)
+    else:
+        match_content = yaml_match.group(1)
+
+    data = yaml.safe_load(match_content) or {}
+    return {key.lstrip(':'): value for key, value in data.items()}
+
+def write_files(directory: str, count: int):
+    files = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            path = os.path.join(directory, f"file{i}.rst")
+            text = (".. metadata::\n"
+                    f"   :content_order: {i}\n"
+                    f"   :content_title: Title of file {i}\n\n"
+                    f"Heading {i}\n==========\n\n" + BODY)
+        elif kind == 1:
+            path = os.path.join(directory, f"file{i}.md")
+            text = ("---\n"
+                    f"content_order: {i}\n"
+                    f"content_title: Title of file {i}\n"
+                    "content_destination: chapters/combined\n"
+                    "---\n\n"
+                    f"# Heading {i}\n\n" + BODY)
+        else:
+            path = os.path.join(directory, f"file{i}.md")
+            text = (f"# Heading {i}\n\n"
+                    "```{metadata}\n"
+                    f":content_order: {i}\n"
+                    f":content_title: 'Quoted: title {i}'\n"
+                    "```\n\n" + BODY)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        files.append(path)
+
+    return files
+
+def legacy(filepath: str):
+    return legacy_md_fields(filepath) if filepath.endswith('.md') else legacy_rst_fields(filepath)
+
+def streaming(filepath: str):
+    if filepath.endswith('.md'):
+        return read_metadata_block(filepath, (FRONT_MATTER, FENCE))
+    return read_metadata_block(filepath, (RST_DIRECTIVE,))
+
+def best_of(func, files, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for filepath in files:
+            func(filepath)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the streaming metadata parser against the regex + YAML implementation.")
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = write_files(directory, args.files)
+
+        mismatches = [f for f in files if legacy(f) != streaming(f)]
+        if mismatches:
+            print(f"❌ {len(mismatches)} files parsed differently, e.g. {mismatches[0]}")
+            sys.exit(1)
+
+        legacy_time = best_of(legacy, files, args.repeat)
+        streaming_time = best_of(streaming, files, args.repeat)
+
+    print(f"Files:     {args.files} (rst field list, front matter and {{metadata}} fence, 1/3 each)")
+    print(f"Legacy:    {legacy_time * 1000:8.1f} ms  ({legacy_time / args.files * 1e6:6.1f} us/file)")
+    print(f"Streaming: {streaming_time * 1000:8.1f} ms  ({streaming_time / args.files * 1e6:6.1f} us/file)")
+    print(f"Speedup:   {legacy_time / streaming_time:.1f}x")
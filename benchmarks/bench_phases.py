@@ -0,0 +1,260 @@
+"""
+Times the phases of the index generation separately for the dynamic_handling
+extension and for generator.py on a synthetic corpus of configurable shape:
+
+  scan      directory traversal (extension: scan_tree, generator: top level chapter listing)
+  metadata  .chapterconf and metadata extraction (generator: preload_metadata incl. its os.walk)
+  render    chapter and master index rendering (generator: incl. its per directory listing)
+  includes  inclusion list rendering
+  write     writing the rendered files to disk
+
+Rendered files are captured in memory so rendering and writing are timed apart.
+Each phase reports the best of --repeat runs on a warm page cache. The results
+are printed (or written with --output) as JSON and can be compared against a
+baseline recorded with --save-baseline; phases slower than the baseline by more
+than --threshold (and --min-delta seconds) fail the run.
+
+Usage: python benchmarks/bench_phases.py [--chapters 10 --depth 3 ...] [--baseline benchmarks/phases_baseline.json]
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import builtins
+import tempfile
+import contextlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'extensions'))
+
+import generator
+import dynamic_handling
+from chapter_tree import scan_tree
+from corpus import make_corpus
+
+PHASES = ('scan', 'metadata', 'render', 'includes', 'write')
+
+class CapturedFile(io.StringIO):
+    """In-memory stand-in for a file opened for writing, stored in captured on close."""
+
+    def __init__(self, captured: dict, path: str):
+        super().__init__()
+        self.captured = captured
+        self.path = path
+
+    def close(self):
+        if not self.closed:
+            self.captured[self.path] = self.getvalue()
+        super().close()
+
+@contextlib.contextmanager
+def capture_generator_writes(captured: dict):
+    """Makes generator.py write its output files into captured instead of to disk."""
+    def capturing_open(file, mode='r', *args, **kwargs):
+        if 'w' in mode:
+            return CapturedFile(captured, file)
+        return builtins.open(file, mode, *args, **kwargs)
+
+    generator.open = capturing_open
+    try:
+        yield
+    finally:
+        del generator.open
+
+@contextlib.contextmanager
+def capture_extension_writes(captured: dict):
+    """Makes the extension hand its output files to captured instead of writing them."""
+    write_if_changed = dynamic_handling.write_if_changed
+    dynamic_handling.write_if_changed = lambda file_path, content: captured.__setitem__(file_path, content) or True
+    try:
+        yield
+    finally:
+        dynamic_handling.write_if_changed = write_if_changed
+
+class PhaseTimer:
+    def __init__(self):
+        self.times = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        yield
+        self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
+
+def run_extension(root_dir: str) -> dict:
+    """Runs the generation steps of generate_files phase by phase."""
+    dynamic_handling.METADATA_CACHE = None
+    dynamic_handling.JOBS = 1
+    dynamic_handling.SCAN_WORKERS = 0
+    dynamic_handling.FILES_TO_CLEANUP.clear()
+    dynamic_handling.OUTDATED_INDICES.clear()
+    dynamic_handling.SNAPSHOT = {'settings': None, 'indices': {}, 'includes': {}, 'master': {}}
+    dynamic_handling.WRITE_STATS.update(written=0, unchanged=0)
+
+    timer = PhaseTimer()
+    captured = {}
+
+    with timer.phase('scan'):
+        chapters_tree = scan_tree(os.path.join(root_dir, 'chapters'))
+
+    with timer.phase('metadata'):
+        dynamic_handling.load_tree_metadata(chapters_tree)
+
+    with capture_extension_writes(captured):
+        with timer.phase('render'):
+            chapters = sorted((directory for directory in chapters_tree.directories if directory.config),
+                              key=lambda directory: directory.config['order'])
+            for chapter in chapters:
+                dynamic_handling.process_directory(root_dir, chapter)
+
+            dynamic_handling.update_master_index(root_dir, [
+                {'path_name': chapter.name, 'order': chapter.config['order'], 'title': chapter.config['title'] or chapter.name}
+                for chapter in chapters
+            ])
+
+        with timer.phase('includes'):
+            dynamic_handling.generate_combined_includes(root_dir, chapters_tree)
+
+    with timer.phase('write'):
+        for file_path, content in captured.items():
+            dynamic_handling.write_if_changed(file_path, content)
+
+    return timer.times, list(captured)
+
+def run_generator(root_dir: str) -> dict:
+    """Runs the generation steps of generator.py phase by phase."""
+    generator.METADATA.clear()
+    generator.DIRECTORIES.clear()
+    generator.GENERATED_FILES.clear()
+
+    timer = PhaseTimer()
+    captured = {}
+    chapters_root = os.path.join(root_dir, 'chapters')
+
+    with capture_generator_writes(captured):
+        with timer.phase('scan'):
+            chapters = generator.collect_top_level_chapters(chapters_root)
+
+        with timer.phase('metadata'):
+            generator.preload_metadata(chapters_root, 1)
+
+        with timer.phase('render'):
+            for chapter in chapters:
+                generator.process_directory(root_dir, os.path.join(chapters_root, chapter['path_name']), chapter['path_name'])
+            generator.update_master_index(root_dir, chapters)
+
+        with timer.phase('includes'):
+            generator.generate_combined_includes(root_dir)
+
+    with timer.phase('write'):
+        for file_path, content in captured.items():
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    return timer.times, list(captured)
+
+def benchmark(root_dir: str, run, repeat: int) -> dict:
+    """Returns the best time per phase over repeat runs, removing the generated files after each run."""
+    best = {}
+
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            times, written = run(root_dir)
+
+        for file_path in written:
+            os.remove(file_path)
+
+        for phase in PHASES:
+            best[phase] = min(best.get(phase, float('inf')), times.get(phase, 0.0))
+
+    best['total'] = sum(best[phase] for phase in PHASES)
+    return {phase: round(seconds, 6) for phase, seconds in best.items()}
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> bool:
+    """Prints the change per phase against baseline, returns False if any phase regressed."""
+    if baseline['corpus'] != results['corpus']:
+        print("❌ The baseline was recorded for a different corpus, re-record it with --save-baseline.")
+        return False
+
+    passed = True
+    for implementation, phases in results['results'].items():
+        for phase, seconds in phases.items():
+            reference = baseline['results'].get(implementation, {}).get(phase)
+            if reference is None:
+                continue
+
+            change = (seconds - reference) / reference if reference else 0.0
+            regressed = seconds > reference * (1 + threshold) and seconds - reference > min_delta
+            passed = passed and not regressed
+
+            print(f"{'❌' if regressed else '  '} {implementation:>9} {phase:>8}: {seconds * 1000:9.1f} ms "
+                  f"(baseline {reference * 1000:9.1f} ms, {change:+.0%})")
+
+    return passed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the generation phases of the extension and generator.py.")
+    parser.add_argument('--chapters', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--files-per-dir', type=int, default=10)
+    parser.add_argument('--sub-dirs', type=int, default=2)
+    parser.add_argument('--md-fraction', type=float, default=0.3, help="Fraction of Markdown files.")
+    parser.add_argument('--destination-fraction', type=float, default=0.1, help="Fraction of :content_destination: fragments.")
+    parser.add_argument('--container-dirs', type=int, default=1, help="Folders without .chapterconf per chapter directory.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=str, help="Write the JSON results to this file instead of printing them.")
+    parser.add_argument('--baseline', type=str, help="Compare against the JSON results stored in this file.")
+    parser.add_argument('--save-baseline', type=str, help="Store the results as the new baseline in this file.")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown per phase, as a fraction of the baseline.")
+    parser.add_argument('--min-delta', type=float, default=0.005, help="Slowdowns below this many seconds are ignored as noise.")
+    args = parser.parse_args()
+
+    corpus = {
+        'chapters': args.chapters,
+        'depth': args.depth,
+        'files_per_dir': args.files_per_dir,
+        'sub_dirs': args.sub_dirs,
+        'md_fraction': args.md_fraction,
+        'destination_fraction': args.destination_fraction,
+        'container_dirs': args.container_dirs,
+        'seed': args.seed
+    }
+
+    root_dir = tempfile.mkdtemp()
+    try:
+        corpus['files'] = make_corpus(root_dir, args.chapters, args.depth, args.files_per_dir, args.sub_dirs,
+                                      args.md_fraction, args.destination_fraction, args.container_dirs, args.seed)
+
+        results = {
+            'corpus': corpus,
+            'repeat': args.repeat,
+            'results': {
+                'extension': benchmark(root_dir, run_extension, args.repeat),
+                'generator': benchmark(root_dir, run_generator, args.repeat)
+            }
+        }
+    finally:
+        shutil.rmtree(root_dir)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(report + "\n")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        if not compare(results, baseline, args.threshold, args.min_delta):
+            sys.exit(1)
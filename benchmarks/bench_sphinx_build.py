@@ -0,0 +1,213 @@
+"""
+End to end scaling benchmark: runs real sphinx-build invocations of source/
+(conf.py, extensions, static files) over synthetic corpora of increasing size,
+cold (empty build directory) and warm (rebuild without changes), serial and
+with -j. Records per build the wall time, the time spent in the startup and
+generation, reading and writing phases (taken from the build log), the peak
+RSS and the size of the HTML output and doctrees. The results are written as
+JSON and the scaling curve as a dependency free SVG plot. Runs fully offline.
+
+Usage: python benchmarks/bench_sphinx_build.py [--sizes 100,1000,10000,50000] [--jobs 4] [--output-dir bench-results]
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import hashlib
+import tempfile
+import subprocess
+import importlib.util
+from typing import Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(BENCH_DIR, '..', 'source')
+
+from corpus import make_corpus
+
+# Build log lines marking the start of the reading and writing phases (of the html
+# builder, the message catalog builder runs before it)
+READ_MARKER = 'updating environment'
+WRITE_MARKERS = ('preparing documents', 'writing output')
+
+FILES_PER_DIR = 20
+SUB_DIRS = 2
+DEPTH = 2
+SERIES_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
+
+def prepare_source(work_dir: str, docs: int, md_fraction: float, destination_fraction: float) -> Tuple[str, int]:
+    """
+    Copies source/ without its chapters and adds a synthetic corpus of exactly docs
+    documents, the last chapter holds the remainder. Returns the source directory
+    and the number of documents written.
+    """
+    src_dir = os.path.join(work_dir, 'src')
+    shutil.copytree(SOURCE_DIR, src_dir, ignore=shutil.ignore_patterns('chapters', '_build', '__pycache__'))
+
+    files_per_chapter = FILES_PER_DIR * sum(SUB_DIRS ** level for level in range(DEPTH))
+    chapters = max(1, math.ceil(docs / files_per_chapter))
+    count = make_corpus(src_dir, chapters, DEPTH, FILES_PER_DIR, SUB_DIRS, md_fraction, destination_fraction,
+                        max_files=docs)
+
+    return src_dir, count
+
+def directory_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+def extension_digest() -> str:
+    """Identifies the measured dynamic_handling implementation in the results."""
+    with open(os.path.join(SOURCE_DIR, 'extensions', 'dynamic_handling.py'), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def run_build(src_dir: str, out_dir: str, doctree_dir: str, jobs: int, theme: str, log_path: str) -> dict:
+    """Runs one sphinx-build and returns its measurements."""
+    command = [sys.executable, '-m', 'sphinx', '-b', 'html', '-d', doctree_dir, '-j', str(jobs), src_dir, out_dir]
+    if theme:
+        command += ['-D', f'html_theme={theme}']
+
+    # Unbuffered output, so the log lines arrive when the phases start
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+
+    start = time.perf_counter()
+    read_start = write_start = None
+
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen(command, cwd=src_dir, env=env, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, text=True, errors='replace')
+        for line in process.stdout:
+            log.write(line)
+            now = time.perf_counter()
+            if read_start is None and READ_MARKER in line:
+                read_start = now
+            if read_start is not None and write_start is None and any(marker in line for marker in WRITE_MARKERS):
+                write_start = now
+
+        # wait4 instead of wait, to get the resource usage of this build only
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    end = time.perf_counter()
+    read_start = read_start or end
+    write_start = write_start or end
+
+    return {
+        'returncode': process.returncode,
+        'wall': round(end - start, 3),
+        'phases': {
+            'startup': round(read_start - start, 3),
+            'read': round(write_start - read_start, 3),
+            'write': round(end - write_start, 3)
+        },
+        # ru_maxrss is in KiB on Linux; covers the build and its (-j) worker processes
+        'peak_rss_mb': round(rusage.ru_maxrss / 1024, 1),
+        'html_bytes': directory_size(out_dir),
+        'doctree_bytes': directory_size(doctree_dir)
+    }
+
+def write_svg_plot(records: list, path: str):
+    """Plots wall time over document count (log-log), one line per jobs/cold/warm series."""
+    width, height, margin = 720, 440, 60
+    series = {}
+    for record in records:
+        series.setdefault(f"-j {record['jobs']} {record['mode']}", []).append((record['docs'], record['wall']))
+
+    points = [point for values in series.values() for point in values if point[1] > 0]
+    if not points:
+        return
+
+    min_x, max_x = math.log10(min(p[0] for p in points)), math.log10(max(p[0] for p in points))
+    min_y, max_y = math.log10(min(p[1] for p in points)), math.log10(max(p[1] for p in points))
+    span_x, span_y = (max_x - min_x) or 1, (max_y - min_y) or 1
+
+    def scale(docs, seconds):
+        x = margin + (math.log10(docs) - min_x) / span_x * (width - 2 * margin)
+        y = height - margin - (math.log10(seconds) - min_y) / span_y * (height - 2 * margin)
+        return f"{x:.1f},{y:.1f}"
+
+    elements = [
+        f'<line x1="{margin}" y1="{height - margin}" x2="{width - margin}" y2="{height - margin}" stroke="black"/>',
+        f'<line x1="{margin}" y1="{margin}" x2="{margin}" y2="{height - margin}" stroke="black"/>',
+        f'<text x="{width / 2}" y="{height - 15}" text-anchor="middle">documents (log)</text>',
+        f'<text x="15" y="{height / 2}" transform="rotate(-90 15 {height / 2})" text-anchor="middle">wall time s (log)</text>'
+    ]
+    for docs in sorted({p[0] for p in points}):
+        x = scale(docs, 10 ** min_y).split(',')[0]
+        elements.append(f'<text x="{x}" y="{height - margin + 18}" text-anchor="middle" font-size="11">{docs}</text>')
+    for seconds in (10 ** min_y, 10 ** max_y):
+        y = scale(10 ** min_x, seconds).split(',')[1]
+        elements.append(f'<text x="{margin - 5}" y="{y}" text-anchor="end" font-size="11">{seconds:.1f}</text>')
+
+    for index, (label, values) in enumerate(sorted(series.items())):
+        color = SERIES_COLORS[index % len(SERIES_COLORS)]
+        coordinates = " ".join(scale(docs, seconds) for docs, seconds in sorted(values) if seconds > 0)
+        elements.append(f'<polyline points="{coordinates}" fill="none" stroke="{color}" stroke-width="2"/>')
+        elements.append(f'<text x="{width - margin + 5 - 150}" y="{margin + 16 * index}" fill="{color}" font-size="12">{label}</text>')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="sans-serif">\n')
+        f.write("\n".join(elements))
+        f.write("\n</svg>\n")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark full sphinx-build runs over synthetic corpora of increasing size.")
+    parser.add_argument('--sizes', type=str, default='100,1000,5000,10000,50000', help="Comma separated document counts.")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="-j value of the parallel builds.")
+    parser.add_argument('--md-fraction', type=float, default=0.3, help="Fraction of Markdown documents.")
+    parser.add_argument('--destination-fraction', type=float, default=0.05, help="Fraction of :content_destination: fragments.")
+    parser.add_argument('--theme', type=str, help="HTML theme, defaults to the one in conf.py (alabaster if that is not installed).")
+    parser.add_argument('--output-dir', type=str, default='bench-results', help="Directory for results.json, scaling.svg and the build logs.")
+    parser.add_argument('--keep', action='store_true', help="Keep the generated sources and build output.")
+    args = parser.parse_args()
+    digest = extension_digest()
+    print(f"Measuring source/extensions/dynamic_handling.py ({digest})")
+
+    theme = args.theme
+    if theme is None and importlib.util.find_spec('furo') is None:
+        print("furo is not installed, building with alabaster.")
+        theme = 'alabaster'
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    sizes = [int(size) for size in args.sizes.split(',')]
+    job_counts = sorted({1, args.jobs})
+    records = []
+
+    for docs in sizes:
+        work_dir = tempfile.mkdtemp(prefix=f'sphinx-bench-{docs}-')
+        try:
+            src_dir, doc_count = prepare_source(work_dir, docs, args.md_fraction, args.destination_fraction)
+
+            for jobs in job_counts:
+                out_dir = os.path.join(work_dir, f'html-j{jobs}')
+                doctree_dir = os.path.join(work_dir, f'doctrees-j{jobs}')
+
+                for mode in ('cold', 'warm'):
+                    log_path = os.path.join(args.output_dir, f'build-{docs}-j{jobs}-{mode}.log')
+                    record = {'docs': doc_count, 'jobs': jobs, 'mode': mode}
+                    record.update(run_build(src_dir, out_dir, doctree_dir, jobs, theme, log_path))
+                    records.append(record)
+
+                    status = "" if record['returncode'] == 0 else f"  ❌ failed, see {log_path}"
+                    print(f"{doc_count:>6} docs  -j {jobs:<3} {mode:>4}: {record['wall']:8.2f}s "
+                          f"(startup {record['phases']['startup']:.2f}s, read {record['phases']['read']:.2f}s, "
+                          f"write {record['phases']['write']:.2f}s)  {record['peak_rss_mb']:8.1f} MB  "
+                          f"{record['html_bytes'] / 1024 / 1024:8.1f} MB html{status}")
+        finally:
+            if args.keep:
+                print(f"Kept {work_dir}")
+            else:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(os.path.join(args.output_dir, 'results.json'), 'w', encoding='utf-8') as f:
+        json.dump({'theme': theme, 'dynamic_handling_sha256': digest, 'records': records}, f, indent=2)
+
+    write_svg_plot(records, os.path.join(args.output_dir, 'scaling.svg'))
+    print(f"Results written to {args.output_dir}/results.json and {args.output_dir}/scaling.svg")
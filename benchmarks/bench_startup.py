@@ -0,0 +1,70 @@
+"""
+Startup time benchmark of generator.py: runs it with `python -X importtime` and
+sums the import time of every module it imports on top of what a bare
+interpreter already imports at startup. Fails if that time exceeds the budget
+or if a module that must only be imported lazily (or never, like Sphinx) is
+imported at startup.
+
+Usage: python benchmarks/bench_startup.py [--budget-ms 12] [--repeat 10]
+"""
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+from typing import Dict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR = os.path.join(BENCH_DIR, '..', 'generator.py')
+
+# Modules generator.py must not import at startup
+FORBIDDEN_MODULES = ('sphinx', 'docutils', 'yaml', 'curses', 'concurrent', 'ctypes', 'file_watcher')
+
+def import_times(arguments) -> Dict[str, int]:
+    """Runs python -X importtime with arguments and returns the self import time (us) per module."""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + arguments,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_time, _, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(self_time)
+
+    return times
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check the import time of generator.py against a budget.")
+    parser.add_argument('--budget-ms', type=float, default=12.0, help="Maximum import time on top of a bare interpreter.")
+    parser.add_argument('--repeat', type=int, default=10, help="Number of runs, the fastest one is compared to the budget.")
+    parser.add_argument('--top', type=int, default=10, help="Number of slowest imports to list.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        # An empty root directory makes the generator exit right after parsing its arguments
+        generator_arguments = [GENERATOR, '--root-dir', root_dir]
+
+        best = None
+        for _ in range(args.repeat):
+            interpreter = import_times(['-c', 'pass'])
+            modules = {module: us for module, us in import_times(generator_arguments).items() if module not in interpreter}
+
+            if best is None or sum(modules.values()) < sum(best.values()):
+                best = modules
+
+    total_ms = sum(best.values()) / 1000
+    print(f"generator.py imports {len(best)} modules on top of the interpreter in {total_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    for module, us in sorted(best.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.2f} ms  {module}")
+
+    forbidden = sorted(module for module in best if module.split('.')[0] in FORBIDDEN_MODULES)
+    if forbidden:
+        print(f"❌ Modules that must not be imported at startup: {', '.join(forbidden)}")
+
+    if total_ms > args.budget_ms:
+        print(f"❌ Import time exceeds the budget by {total_ms - args.budget_ms:.1f} ms")
+
+    if forbidden or total_ms > args.budget_ms:
+        sys.exit(1)
@@ -0,0 +1,65 @@
+"""
+Compares the sequential and the concurrent traversal of the dynamic_handling
+extension on a synthetic corpus, with an artificial per syscall latency
+injected to emulate a network file system.
+
+Usage: python benchmarks/bench_traversal.py [--latency 0.002] [--workers 32]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'extensions'))
+
+import dynamic_handling
+from chapter_tree import scan_tree
+from corpus import make_corpus
+from latency_shim import injected_latency
+
+def generate(root_dir: str, scan_workers: int):
+    """Runs the scan, metadata and index generation steps of generate_files."""
+    dynamic_handling.METADATA_CACHE = None
+    dynamic_handling.JOBS = 1
+    dynamic_handling.SCAN_WORKERS = scan_workers
+    dynamic_handling.WRITE_STATS.update(written=0, unchanged=0)
+
+    tree = scan_tree(root_dir, workers=scan_workers)
+    dynamic_handling.load_tree_metadata(tree)
+
+    for chapter in tree.find('chapters').directories:
+        dynamic_handling.process_directory(root_dir, chapter)
+
+    return dict(dynamic_handling.WRITE_STATS)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs concurrent traversal under injected latency.")
+    parser.add_argument('--latency', type=float, default=0.002, help="Seconds added to every scandir/stat/open call.")
+    parser.add_argument('--workers', type=int, default=32, help="scan_workers used for the concurrent run.")
+    parser.add_argument('--chapters', type=int, default=5)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--files-per-dir', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        file_count = make_corpus(root_dir, args.chapters, args.depth, args.files_per_dir)
+        print(f"Corpus: {file_count} content files, latency {args.latency * 1000:.1f} ms per call")
+
+        results = {}
+        for label, workers in (('sequential', 0), ('concurrent', args.workers)):
+            with injected_latency(args.latency) as counter:
+                start = time.perf_counter()
+                stats = generate(root_dir, workers)
+                elapsed = time.perf_counter() - start
+
+            results[label] = elapsed
+            print(f"{label:>10}: {elapsed:8.3f}s  {counter.total} delayed calls  "
+                  f"{stats['written']} indices written, {stats['unchanged']} unchanged")
+
+            if label == 'concurrent' and stats['written']:
+                print("❌ The concurrent traversal generated different index files than the sequential one.")
+                sys.exit(1)
+
+        print(f"Speedup: {results['sequential'] / results['concurrent']:.1f}x")
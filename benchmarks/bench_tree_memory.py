@@ -0,0 +1,128 @@
+"""
+Memory benchmark of the chapter tree model: builds the model for a synthetic
+corpus (1M content files by default) entirely in memory and reports the peak RSS.
+
+The 'slots' variant uses the nodes from extensions/chapter_tree.py. The 'dicts'
+variant rebuilds the previous representation, plain objects storing the full
+path of every node and a metadata dict per file, for comparison. Each variant
+runs in its own subprocess so the peak RSS values do not influence each other.
+
+Usage: python benchmarks/bench_tree_memory.py [--files 1000000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'extensions'))
+
+from chapter_tree import ContentFile, TreeDirectory, iter_files
+
+CHAPTERS = 100
+SUB_CHAPTERS = 10
+
+class DictContentFile:
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.metadata = None
+
+class DictTreeDirectory:
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.config_path = None
+        self.config = None
+        self.children = []
+
+def synthetic_metadata(i: int):
+    return {'order': i * 10, 'title': f"Title {i}", 'destination_file': None, 'valid': True}
+
+def build_dicts(root_path: str, files_per_dir: int):
+    root = DictTreeDirectory('chapters', root_path)
+    for c in range(CHAPTERS):
+        chapter = DictTreeDirectory(f"chapter{c}", os.path.join(root.path, f"chapter{c}"))
+        chapter.config_path = os.path.join(chapter.path, '.chapterconf')
+        chapter.config = {'order': c, 'title': f"Chapter {c}"}
+        root.children.append(chapter)
+
+        for s in range(SUB_CHAPTERS):
+            sub = DictTreeDirectory(f"sub{s}", os.path.join(chapter.path, f"sub{s}"))
+            chapter.children.append(sub)
+
+            for i in range(files_per_dir):
+                name = f"file{i}.rst"
+                content_file = DictContentFile(name, os.path.join(sub.path, name))
+                content_file.metadata = synthetic_metadata(i)
+                sub.children.append(content_file)
+
+    return root
+
+def build_slots(root_path: str, files_per_dir: int):
+    root = TreeDirectory('chapters', path=root_path)
+    for c in range(CHAPTERS):
+        chapter = TreeDirectory(f"chapter{c}", root)
+        chapter.has_config = True
+        chapter.config = {'order': c, 'title': f"Chapter {c}"}
+        root.children.append(chapter)
+
+        for s in range(SUB_CHAPTERS):
+            sub = TreeDirectory(f"sub{s}", chapter)
+            chapter.children.append(sub)
+
+            for i in range(files_per_dir):
+                content_file = ContentFile(f"file{i}.rst", sub)
+                content_file.metadata = synthetic_metadata(i)
+                sub.children.append(content_file)
+
+    return root
+
+def run_variant(variant: str, files: int):
+    files_per_dir = max(1, files // (CHAPTERS * SUB_CHAPTERS))
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if variant == 'dicts':
+        tree = build_dicts('/docs/source/chapters', files_per_dir)
+        count = sum(len(sub.children) for chapter in tree.children for sub in chapter.children)
+    else:
+        tree = build_slots('/docs/source/chapters', files_per_dir)
+        count = sum(1 for _ in iter_files(tree))
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        'variant': variant,
+        'files': count,
+        'build_seconds': round(elapsed, 3),
+        'peak_rss_mb': round(peak_kb / 1024, 1),
+        'model_mb': round((peak_kb - baseline_kb) / 1024, 1)
+    }))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Peak RSS of the chapter tree model for a synthetic corpus.")
+    parser.add_argument('--files', type=int, default=1000000)
+    parser.add_argument('--variant', choices=['dicts', 'slots'], help="Run a single variant in this process.")
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.files)
+        sys.exit(0)
+
+    results = {}
+    for variant in ('dicts', 'slots'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--files', str(args.files), '--variant', variant],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results[variant] = json.loads(output)
+
+    for variant, result in results.items():
+        print(f"{variant:>6}: {result['files']} files  peak RSS {result['peak_rss_mb']:8.1f} MB  "
+              f"(model {result['model_mb']:8.1f} MB)  built in {result['build_seconds']:.2f}s")
+
+    print(f"Model memory reduced {results['dicts']['model_mb'] / max(results['slots']['model_mb'], 0.1):.1f}x")
@@ -0,0 +1,92 @@
+"""Synthesizes chapter trees for the benchmarks."""
+import os
+import random
+
+def write_chapter_config(path: str, title: str, order: int):
+    with open(os.path.join(path, '.chapterconf'), 'w', encoding='utf-8') as f:
+        f.write(f"[Chapter]\ntitle = {title}\norder = {order}\n")
+
+def write_rst(path: str, title: str, order: int, destination: str = None):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(
+            ".. metadata::\n"
+            f"   :content_order: {order}\n"
+            f"   :content_title: {title}\n"
+            + (f"   :content_destination: {destination}\n" if destination else "")
+            + f"\n{title}\n{'=' * len(title)}\n\nSome content.\n"
+        )
+
+def write_md(path: str, title: str, order: int, destination: str = None):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(
+            "---\n"
+            f"content_order: {order}\n"
+            f"content_title: {title}\n"
+            + (f"content_destination: {destination}\n" if destination else "")
+            + f"---\n\n# {title}\n\nSome content.\n"
+        )
+
+def write_index_template(root_dir: str):
+    with open(os.path.join(root_dir, 'index_template.rst'), 'w', encoding='utf-8') as f:
+        f.write("Benchmark\n=========\n\n.. toctree::\n   :maxdepth: 2\n\n<<DYNAMIC_CHAPTER_LINKS>>\n")
+
+def make_corpus(root_dir: str, chapters: int = 10, depth: int = 2, files_per_dir: int = 10, sub_dirs: int = 2,
+                md_fraction: float = 0.0, destination_fraction: float = 0.0, container_dirs: int = 0, seed: int = 0,
+                max_files: int = None) -> int:
+    """
+    Creates chapters/<chapterN> below root_dir, each nested depth levels deep with
+    sub_dirs sub chapters per level and files_per_dir content files per directory.
+
+    md_fraction of the files are Markdown instead of RST and destination_fraction of
+    them are :content_destination: fragments (one inclusion list per top level chapter).
+    Every chapter directory additionally gets container_dirs folders without a
+    .chapterconf holding files_per_dir files each. With max_files the corpus stops
+    after that many files, so the last chapter holds the remainder. The same arguments
+    always create the same corpus. Returns the number of content files written.
+    """
+    chapters_root = os.path.join(root_dir, 'chapters')
+    rng = random.Random(seed)
+    count = 0
+
+    def full() -> bool:
+        return max_files is not None and count >= max_files
+
+    def write_files(path: str, destination: str):
+        nonlocal count
+        for i in range(files_per_dir):
+            if full():
+                return
+            write = write_md if rng.random() < md_fraction else write_rst
+            extension = '.md' if write is write_md else '.rst'
+            fragment_of = destination if rng.random() < destination_fraction else None
+            write(os.path.join(path, f"file{i}{extension}"), f"File {i}", (i + 1) * 10, fragment_of)
+            count += 1
+
+    def fill(path: str, level: int, destination: str):
+        write_files(path, destination)
+
+        for i in range(container_dirs):
+            if full():
+                return
+            container_path = os.path.join(path, f"container{i}")
+            os.makedirs(container_path)
+            write_files(container_path, destination)
+
+        if level < depth:
+            for i in range(sub_dirs):
+                if full():
+                    return
+                sub_path = os.path.join(path, f"sub{i}")
+                os.makedirs(sub_path)
+                write_chapter_config(sub_path, f"Sub {i}", i)
+                fill(sub_path, level + 1, destination)
+
+    for i in range(chapters):
+        chapter_path = os.path.join(chapters_root, f"chapter{i}")
+        os.makedirs(chapter_path)
+        write_chapter_config(chapter_path, f"Chapter {i}", i)
+        fill(chapter_path, 1, f"chapters/chapter{i}/combined")
+
+    write_index_template(root_dir)
+
+    return count
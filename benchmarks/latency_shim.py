@@ -0,0 +1,53 @@
+"""
+Test shim that injects an artificial delay into the file system calls used by
+the generator (os.scandir, os.stat and open), to emulate a high latency file
+system such as NFS on a local disk.
+"""
+import os
+import time
+import builtins
+import threading
+from contextlib import contextmanager
+
+class SyscallCounter:
+    """Counts the delayed calls per function name."""
+
+    def __init__(self):
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+@contextmanager
+def injected_latency(seconds: float):
+    """Delays every os.scandir, os.stat and open call by seconds while active."""
+    counter = SyscallCounter()
+    originals = {
+        'scandir': os.scandir,
+        'stat': os.stat,
+        'open': builtins.open
+    }
+
+    def delayed(name, func):
+        def wrapper(*args, **kwargs):
+            counter.add(name)
+            time.sleep(seconds)
+            return func(*args, **kwargs)
+        return wrapper
+
+    os.scandir = delayed('scandir', originals['scandir'])
+    os.stat = delayed('stat', originals['stat'])
+    builtins.open = delayed('open', originals['open'])
+
+    try:
+        yield counter
+    finally:
+        os.scandir = originals['scandir']
+        os.stat = originals['stat']
+        builtins.open = originals['open']
@@ -0,0 +1,209 @@
+import os
+import re
+import sys
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+CHAPTER_CONFIG_FILE = '.chapterconf'
+CONTENT_EXTENSIONS = ('.rst', '.md')
+IGNORE_PATTERN = re.compile(r'^ignore\s*=\s*(.*)', re.MULTILINE)
+
+# The tree model can hold millions of nodes, so nodes use __slots__, names are
+# interned (the same file names repeat across directories) and full paths are
+# derived from the parent chain instead of being stored per node.
+
+class ContentFile:
+    """A content file (.rst/.md) found during the scan, metadata is filled in afterwards."""
+    __slots__ = ('name', 'parent', 'order', 'title', 'destination', 'valid')
+
+    def __init__(self, name: str, parent: 'TreeDirectory'):
+        self.name = sys.intern(name)
+        self.parent = parent
+        # valid is None until the metadata has been loaded
+        self.order = 9999
+        self.title = None
+        self.destination = None
+        self.valid = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.parent.path, self.name)
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        if self.valid is None:
+            return None
+
+        return {
+            'order': self.order,
+            'title': self.title,
+            'destination_file': self.destination,
+            'valid': self.valid
+        }
+
+    @metadata.setter
+    def metadata(self, metadata: Optional[Dict[str, Any]]):
+        if metadata is None:
+            self.valid = None
+            return
+
+        self.order = metadata['order']
+        self.title = metadata['title']
+        self.destination = metadata['destination_file']
+        self.valid = metadata['valid']
+
+class TreeDirectory:
+    """
+    A directory found during the scan. Directories with a .chapterconf are chapters,
+    directories without one are container folders whose content is merged upwards.
+    """
+    __slots__ = ('name', 'parent', 'has_config', 'config', 'children', '_path')
+
+    def __init__(self, name: str, parent: Optional['TreeDirectory'] = None, path: Optional[str] = None):
+        self.name = sys.intern(name)
+        self.parent = parent
+        # Only the root of the tree stores its path
+        self._path = path
+        self.has_config = False
+        self.config = None
+        # Sub directories and content files, sorted by name
+        self.children = []
+
+    @property
+    def path(self) -> str:
+        if self.parent is None:
+            return self._path
+
+        return os.path.join(self.parent.path, self.name)
+
+    @property
+    def config_path(self) -> Optional[str]:
+        return os.path.join(self.path, CHAPTER_CONFIG_FILE) if self.has_config else None
+
+    @property
+    def is_chapter(self) -> bool:
+        return self.has_config
+
+    @property
+    def directories(self) -> List['TreeDirectory']:
+        return [child for child in self.children if isinstance(child, TreeDirectory)]
+
+    def find(self, relative_path: str) -> Optional['TreeDirectory']:
+        """Returns the directory at relative_path below this one, if it was scanned."""
+        node = self
+        for part in os.path.normpath(relative_path).split(os.sep):
+            if part in ('', '.'):
+                continue
+
+            node = next((child for child in node.directories if child.name == part), None)
+            if node is None:
+                return None
+
+        return node
+
+def list_directory(path: str) -> List[os.DirEntry]:
+    """Lists a directory with a single os.scandir call, sorted by name."""
+    with os.scandir(path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+def read_ignore_patterns(config_path: str) -> List[str]:
+    """
+    Returns the glob patterns of the 'ignore =' line of a .chapterconf, separated by
+    commas or whitespace. They are matched against the names of the entries in the
+    directory of the .chapterconf, an ignored directory is skipped with everything below it.
+    """
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            match = IGNORE_PATTERN.search(f.read())
+    except OSError:
+        return []
+
+    return match.group(1).replace(',', ' ').split() if match else []
+
+def scan_directory(path: str) -> Tuple[List[os.DirEntry], List[str]]:
+    """
+    Lists a directory and reads the ignore globs of its .chapterconf, if it has one.
+    Both are file system calls, so they run together in the worker of concurrent scans.
+    """
+    entries = list_directory(path)
+
+    ignore = []
+    if any(entry.name == CHAPTER_CONFIG_FILE for entry in entries):
+        ignore = read_ignore_patterns(os.path.join(path, CHAPTER_CONFIG_FILE))
+
+    return entries, ignore
+
+def fill_directory(node: TreeDirectory, entries: List[os.DirEntry], ignore: List[str],
+                   exclude: Optional[Callable[[str], bool]] = None) -> List[TreeDirectory]:
+    """
+    Adds the scanned entries to node and returns the (still empty) sub directories.
+    The file type comes from the directory entry, so no extra stat calls are made.
+    Entries matching the ignore globs of the .chapterconf of node, or for which
+    exclude(path) is true, are left out before anything below them is opened.
+    """
+    sub_directories = []
+
+    for entry in entries:
+        if entry.name != CHAPTER_CONFIG_FILE:
+            if any(fnmatch.fnmatch(entry.name, pattern) for pattern in ignore):
+                continue
+            if exclude is not None and exclude(entry.path):
+                continue
+
+        if entry.is_dir():
+            sub_directory = TreeDirectory(entry.name, node)
+            node.children.append(sub_directory)
+            sub_directories.append(sub_directory)
+        elif entry.name == CHAPTER_CONFIG_FILE:
+            node.has_config = True
+        elif os.path.splitext(entry.name)[1].lower() in CONTENT_EXTENSIONS:
+            node.children.append(ContentFile(entry.name, node))
+
+    return sub_directories
+
+def scan_tree(path: str, name: str = '', workers: int = 0,
+              exclude: Optional[Callable[[str], bool]] = None) -> TreeDirectory:
+    """
+    Builds the tree model for path with a single os.scandir pass per directory.
+    Directories and files for which exclude(path) is true are pruned during the scan.
+
+    By default the tree is scanned depth first. With workers > 0 up to that many
+    directory listings are kept in flight at once, which hides the per call latency
+    of network file systems. Children are always sorted by name, so both modes
+    produce the same tree model.
+    """
+    root = TreeDirectory(name or os.path.basename(path), path=path)
+
+    if workers <= 0:
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            pending.extend(reversed(fill_directory(node, *scan_directory(node.path), exclude)))
+        return root
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {executor.submit(scan_directory, root.path): root}
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = in_flight.pop(future)
+                for sub_directory in fill_directory(node, *future.result(), exclude):
+                    in_flight[executor.submit(scan_directory, sub_directory.path)] = sub_directory
+
+    return root
+
+def iter_directories(node: TreeDirectory) -> Iterator[TreeDirectory]:
+    """Yields node and all directories below it, depth first in name order."""
+    yield node
+    for child in node.directories:
+        yield from iter_directories(child)
+
+def iter_files(node: TreeDirectory) -> Iterator[ContentFile]:
+    """Yields all content files below node, depth first in name order."""
+    for child in node.children:
+        if isinstance(child, TreeDirectory):
+            yield from iter_files(child)
+        else:
+            yield child
@@ -0,0 +1,202 @@
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+from typing import Dict, Optional, Set, Tuple
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+# Returned instead of a set of paths if events were lost and everything must be rescanned
+OVERFLOW = None
+
+class PollingWatcher:
+    """
+    Portable watcher that compares (mtime_ns, size) snapshots of every file and
+    directory below root_dir. Used where inotify is not available.
+    """
+
+    def __init__(self, root_dir: str, interval: float = 0.5):
+        self.root_dir = root_dir
+        self.interval = interval
+        self.snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        pending = [self.root_dir]
+
+        while pending:
+            path = pending.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+
+                        snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+            except OSError:
+                continue
+
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Returns the paths that were added, removed or modified, waiting up to timeout seconds."""
+        deadline = time.monotonic() + timeout
+
+        while True:
+            snapshot = self._take_snapshot()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """
+    Recursive watcher on top of the Linux inotify API (through ctypes, no third
+    party packages). A watch is added for every directory, including directories
+    created while watching.
+    """
+
+    def __init__(self, root_dir: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.root_dir = root_dir
+        self.watches = {}
+        try:
+            self.add_tree(root_dir)
+        except OSError:
+            self.close()
+            raise
+
+    def add_tree(self, path: str) -> Set[str]:
+        """Watches path and all directories below it, returns the files found in them."""
+        found = set()
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dirpath}")
+
+            self.watches[wd] = dirpath
+            found.update(os.path.join(dirpath, filename) for filename in filenames)
+
+        return found
+
+    def poll(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Returns the paths of all events received within timeout seconds, or OVERFLOW
+        if the kernel queue overflowed and events were lost.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b'\0')
+                offset += name_length
+
+                if mask & IN_Q_OVERFLOW:
+                    return OVERFLOW
+
+                directory = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                if directory is None:
+                    continue
+
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+                changed.add(path)
+
+                # Files created together with a new directory do not produce events of their own
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and os.path.isdir(path):
+                    try:
+                        changed.update(self.add_tree(path))
+                    except OSError:
+                        # Without a watch on the new directory its changes would be missed
+                        return OVERFLOW
+
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+def create_watcher(root_dir: str, polling_interval: float = 0.5):
+    """Returns an inotify watcher where available, falling back to stat polling."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root_dir)
+        except (OSError, AttributeError):
+            # No inotify in libc or the watch limit (fs.inotify.max_user_watches) was reached
+            pass
+
+    return PollingWatcher(root_dir, polling_interval)
+
+def wait_for_changes(watcher, debounce: float) -> Optional[Set[str]]:
+    """
+    Blocks until something changed, then keeps collecting events until none arrived
+    for debounce seconds, so a burst of saves is handled as a single change set.
+    Returns OVERFLOW if events were lost.
+    """
+    changed = set()
+
+    while not changed:
+        events = watcher.poll(3600)
+        if events is OVERFLOW:
+            return OVERFLOW
+        changed.update(events)
+
+    while True:
+        events = watcher.poll(debounce)
+        if events is OVERFLOW:
+            return OVERFLOW
+        if not events:
+            return changed
+        changed.update(events)
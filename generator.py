@@ -1,11 +1,19 @@
-from curses import meta
-from math import comb
 import os
 import re
+import sys
+import time
+import fnmatch
 import argparse
-from textwrap import indent
-from typing import Dict, List, Any
-import yaml # Required for YAML front matter in MyST Markdown
+from typing import Dict, List, Any, Optional, Set
+
+# This script runs from pre-commit hooks and CI steps, so it only imports what every
+# run needs: the thread pool, YAML (through metadata_parser) and the watch mode
+# modules are imported where they are used, and Sphinx is never imported.
+# benchmarks/bench_startup.py keeps the import time within a budget.
+
+# The metadata parser is shared with the Sphinx extension and does not depend on Sphinx
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extensions'))
+from metadata_parser import read_metadata_block, RST_DIRECTIVE, FRONT_MATTER
 
 # --- Configuration (Relative to the script execution path) ---
 # These paths are set relative to the root directory passed via the command line argument.
@@ -15,6 +23,12 @@ MASTER_INDEX_FILE = 'index_template.rst'
 PLACEHOLDER = '<<DYNAMIC_CHAPTER_LINKS>>'
 CHAPTERS_SUB_DIR = 'chapters'
 GENERATED_INCLUDES_EXTENSION = '.rst'
+METADATA = {}
+# Directories seen below the root directory, used in watch mode to tell new and removed directories apart
+DIRECTORIES = set()
+# Inclusion list files written by this script (normalized paths)
+GENERATED_FILES = set()
+IGNORE_PATTERN = re.compile(r'^ignore\s*=\s*(.*)', re.MULTILINE)
 
 def read_chapter_config(path: str) -> Dict[str, Any]:
     """Reads the .chapterconf for title and order."""
@@ -50,6 +64,39 @@ def read_chapter_config(path: str) -> Dict[str, Any]:
         
     return config
 
+def read_ignore_patterns(path: str) -> List[str]:
+    """
+    Reads the glob patterns of the 'ignore =' line of the .chapterconf in path. They are
+    matched against the names of the entries of that directory, ignored directories
+    are skipped with everything below them.
+    """
+    try:
+        with open(os.path.join(path, '.chapterconf'), 'r', encoding='utf-8') as f:
+            match = IGNORE_PATTERN.search(f.read())
+    except OSError:
+        return []
+
+    return match.group(1).replace(',', ' ').split() if match else []
+
+def is_ignored(name: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+def is_ignored_path(path: str, chapters_root: str) -> bool:
+    """Tells whether path lies outside of the chapters root or below an entry ignored by a .chapterconf."""
+    relative_path = os.path.relpath(path, chapters_root)
+    if relative_path == os.curdir:
+        return False
+    if relative_path.split(os.sep)[0] == os.pardir:
+        return True
+
+    directory = chapters_root
+    for part in relative_path.split(os.sep):
+        if is_ignored(part, read_ignore_patterns(directory)):
+            return True
+        directory = os.path.join(directory, part)
+
+    return False
+
 def extract_md_metadata(filepath: str) -> Dict[str, Any]:
     """Reads metadata (order and title) from YAML front matter in a Markdown file."""
     metadata = {
@@ -60,19 +107,13 @@ def extract_md_metadata(filepath: str) -> Dict[str, Any]:
     }
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Regex to find the YAML front matter block (must be at the start)
-        yaml_match = re.match(r'---\s*\n(.*?)\n---', content, re.DOTALL)
+        # The YAML front matter block (must be at the start)
+        data = read_metadata_block(filepath, (FRONT_MATTER,))
         
-        if not yaml_match:
+        if data is None:
             print(f"⚠️ WARNING: Missing or malformed YAML front matter in {filepath}. Skipping.")
-            print(f"   {content}")
             metadata['valid'] = False
-        
-        # Parse the YAML content
-        data = yaml.safe_load(yaml_match.group(1)) or {}
+            data = {}
 
         if isinstance(data.get('content_order'), int):
             metadata['order'] = data.get('content_order')
@@ -120,47 +161,74 @@ def extract_rst_metadata(filepath: str) -> Dict[str, Any]:
         'valid': True  # Flag to track successful extraction of ORDER
     }
 
-    metadata_yaml_pattern = re.compile(
-        r'^\.\.\s*metadata::\s*\n'
-        r'(.*?)'
-        r'(?=\n\S|\Z)',
-        re.DOTALL | re.MULTILINE
-    )
-
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            head_content = f.read(1000)
-
-            yaml_match = metadata_yaml_pattern.search(head_content)
-
-            if yaml_match:
-                yaml_content = yaml_match.group(1)
-
-                first_line = [line for line in yaml_content.splitlines() if line.strip()][0]
-                indent = len(first_line) - len(first_line.lstrip())
+        data = read_metadata_block(filepath, (RST_DIRECTIVE,))
 
-                unindented_content = re.sub(r'^\s{' + str(indent) + '}', '', yaml_content, flags=re.MULTILINE)
-                data = yaml.safe_load(unindented_content) or {}
-                data = {key.lstrip(':'): value for key, value in data.items()}
+        if data is not None:
+            metadata['order'] = data.get('content_order', 9999)
+            metadata['title'] = data.get('content_title')
+            metadata['destination_file'] = data.get('content_destination')
 
-                metadata['order'] = data.get('content_order', 9999)
-                metadata['title'] = data.get('content_title')
-                metadata['destination_file'] = data.get('content_destination')
-
-                if metadata['order'] == 9999:
-                    print(f"⚠️ WARNING: Missing ':content_order:' in {filepath}. Defaulting to order 9999.")
-                    metadata['valid'] = False
+            if metadata['order'] == 9999:
+                print(f"⚠️ WARNING: Missing ':content_order:' in {filepath}. Defaulting to order 9999.")
+                metadata['valid'] = False
     except Exception as e:
         print(f"❌ ERROR: Failed to read RST metadata from {filepath}: {e}")
         metadata['valid'] = False
 
     return metadata
 
-def process_directory(root_dir: str, directory_path: str, chapter_relative_path: str = '') -> List[Dict[str, Any]]:
+def extract_metadata(filepath: str) -> Dict[str, Any]:
+    """Extracts the metadata of a .md or .rst file."""
+    if os.path.splitext(filepath)[1].lower() == '.md':
+        return extract_md_metadata(filepath)
+
+    return extract_rst_metadata(filepath)
+
+def get_metadata(filepath: str) -> Dict[str, Any]:
+    """Returns the metadata extracted up front by preload_metadata, extracting it now if missing."""
+    if filepath not in METADATA:
+        METADATA[filepath] = extract_metadata(filepath)
+
+    return METADATA[filepath]
+
+def preload_metadata(chapters_root: str, jobs: int):
+    """
+    Extracts the metadata of every .rst/.md file below the chapters root up front,
+    using a thread pool when jobs > 1. Results are stored by path, so the toctrees
+    assembled afterwards do not depend on the order the workers finish in.
+    Entries ignored by a .chapterconf are pruned before they are opened.
+    """
+    filepaths = []
+    for dirpath, dirnames, filenames in os.walk(chapters_root):
+        DIRECTORIES.add(dirpath)
+        ignore = read_ignore_patterns(dirpath) if '.chapterconf' in filenames else []
+        dirnames[:] = sorted(dirname for dirname in dirnames if not is_ignored(dirname, ignore))
+        for filename in sorted(filenames):
+            if is_ignored(filename, ignore):
+                continue
+            if os.path.splitext(filename)[1].lower() in ('.md', '.rst'):
+                filepaths.append(os.path.join(dirpath, filename))
+
+    print(f"🔍 Extracting metadata from {len(filepaths)} files using {jobs} worker(s)")
+
+    if jobs > 1 and len(filepaths) > 1:
+        from concurrent.futures import ThreadPoolExecutor # Only needed for parallel extraction
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(extract_metadata, filepaths))
+    else:
+        results = [extract_metadata(filepath) for filepath in filepaths]
+
+    METADATA.update(zip(filepaths, results))
+
+def process_directory(root_dir: str, directory_path: str, chapter_relative_path: str = '', recursive: bool = True) -> List[Dict[str, Any]]:
     """
     Recursively scans a directory for content files (.md/.rst) and sub-chapter 
     directories (.chapterconf), generates the index.rst for the current 
     directory, and returns the sorted list of items.
+    With recursive=False the indices of sub-chapters are not regenerated, only
+    container folders (whose content is merged into this index) are scanned.
     """
     if not os.path.isdir(directory_path):
         return []
@@ -168,9 +236,13 @@ def process_directory(root_dir: str, directory_path: str, chapter_relative_path:
     print(f"\n🔨 Processing directory: {directory_path}")
     
     items_to_link = []
+    ignore = read_ignore_patterns(directory_path)
     
     # Scan directory and collect metadata
     for item in sorted(os.listdir(directory_path)):
+        if is_ignored(item, ignore):
+            continue
+
         full_path = os.path.join(directory_path, item)
         relative_path_name = os.path.join(chapter_relative_path, item)
 
@@ -186,7 +258,9 @@ def process_directory(root_dir: str, directory_path: str, chapter_relative_path:
             config = read_chapter_config(full_path)
             
             # Recursively process the sub-chapter first
-            sub_chapter_content = process_directory(root_dir, full_path, relative_path_name)
+            sub_chapter_content = []
+            if recursive or not config:
+                sub_chapter_content = process_directory(root_dir, full_path, relative_path_name, recursive)
 
             if config:    
                 # Use the config data for linking in the parent index
@@ -215,10 +289,8 @@ def process_directory(root_dir: str, directory_path: str, chapter_relative_path:
             file_extension = os.path.splitext(item)[1].lower()
             
             metadata = None
-            if file_extension == '.md':
-                metadata = extract_md_metadata(full_path)
-            elif file_extension == '.rst':
-                metadata = extract_rst_metadata(full_path)
+            if file_extension in ('.md', '.rst'):
+                metadata = get_metadata(full_path)
                 
             if metadata:
                 if metadata.get('destination_file'):
@@ -337,39 +409,39 @@ def update_master_index(root_dir: str, all_chapters: List[Dict[str, Any]]):
         print(f"❌ Fatal Error: Could not access or write files: {e}")
 
 
-def generate_combined_includes(root_dir: str):
+def generate_combined_includes(root_dir: str, destinations: Optional[Set[str]] = None):
     """
-    Scans recursively for RST files, reads their ':content_destination:' metadata, and 
-    generates the inclusion list file at the designated location with 
-    correct relative paths.
+    Reads the ':content_destination:' metadata of all RST/MD files (extracted up front
+    by preload_metadata), and generates the inclusion list file at the designated
+    location with correct relative paths. If destinations is given, only the
+    inclusion lists of those destinations are written.
     """
 
     combined_files_map = {}
 
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for filename in filenames:
-            # We only look at RST files for the dynamic include feature
-            metadata = None
-            if filename.endswith(GENERATED_INCLUDES_EXTENSION) and filename != 'index.rst':
-                filepath = os.path.join(dirpath, filename)
-                metadata = extract_rst_metadata(filepath)
-            elif filename.endswith(".md") and filename != 'index.md':
-                filepath = os.path.join(dirpath, filename)
-                metadata = extract_md_metadata(filepath)
-
-            if metadata is not None:
-                dest_file_base = metadata.get('destination_file')
-                order = metadata.get('order')
-
-                if dest_file_base:
-                    if dest_file_base not in combined_files_map:
-                        combined_files_map[dest_file_base] = []
-                    
-                    # Store the FULL path to the source content file    
-                    combined_files_map[dest_file_base].append({
-                        'full_path': filepath,
-                        'order': order
-                    })
+    for filepath in list(METADATA):
+        filename = os.path.basename(filepath)
+
+        # We only look at RST files for the dynamic include feature
+        metadata = None
+        if filename.endswith(GENERATED_INCLUDES_EXTENSION) and filename != 'index.rst':
+            metadata = get_metadata(filepath)
+        elif filename.endswith(".md") and filename != 'index.md':
+            metadata = get_metadata(filepath)
+
+        if metadata is not None:
+            dest_file_base = metadata.get('destination_file')
+            order = metadata.get('order')
+
+            if dest_file_base:
+                if dest_file_base not in combined_files_map:
+                    combined_files_map[dest_file_base] = []
+                
+                # Store the FULL path to the source content file    
+                combined_files_map[dest_file_base].append({
+                    'full_path': filepath,
+                    'order': order
+                })
 
     print("\n🔨 Generating dynamic include files...")
     if not combined_files_map:
@@ -377,10 +449,14 @@ def generate_combined_includes(root_dir: str):
         return
 
     for dest_file_base, files_to_include in combined_files_map.items():
+        if destinations is not None and dest_file_base not in destinations:
+            continue
+
         files_to_include.sort(key=lambda x: x['order'])
 
         # Determine the full path of the generated inclusion list file
         output_file_path = os.path.join(root_dir, f"{dest_file_base}{GENERATED_INCLUDES_EXTENSION}")
+        GENERATED_FILES.add(os.path.normpath(output_file_path))
 
         # Ensure the destination directory exists
         os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
@@ -406,33 +482,13 @@ def generate_combined_includes(root_dir: str):
 
         print(f"✅ Generated inclusion list: {os.path.relpath(output_file_path, root_dir)} ({len(files_to_include)} content files)")
 
-
-if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description="Generate Sphinx TOCTREE indices recursively.")
-    parser.add_argument('--root-dir', type=str, default='.', 
-                        help="The root directory containing the source files (e.g., '.' or '/tmp/source').")
-    parser.add_argument('--chapters-dir', type=str, default='chapters')
-    parser.add_argument('--index-template', type=str, default='index_template.rst', 
-                        help="File to use as a top index template. Must contain a <<DYNAMIC_CHAPTER_LINKS>> line.")
-                       
-    args = parser.parse_args()
-    
-    ROOT_DIR = args.root_dir
-    CHAPTERS_SUB_DIR = args.chapters_dir
-    MASTER_INDEX_FILE = args.index_template
-    CHAPTERS_ROOT = os.path.join(ROOT_DIR, CHAPTERS_SUB_DIR)
-    
-    print(f"▶️ Sphinx Dynamic Chapter Generator Initiated (Root: {ROOT_DIR})")
-    
-    if not os.path.isdir(CHAPTERS_ROOT):
-        print(f"❌ Fatal Error: Chapter root directory not found: {CHAPTERS_ROOT}")
-        exit(1)
-        
+def collect_top_level_chapters(chapters_root: str) -> List[Dict[str, Any]]:
+    """Returns the sorted top-level chapters (directories with a .chapterconf) of the chapters root."""
     top_level_chapters = []
     
     # Scan only the top level of the chapters root
-    for item in os.listdir(CHAPTERS_ROOT):
-        full_path = os.path.join(CHAPTERS_ROOT, item)
+    for item in os.listdir(chapters_root):
+        full_path = os.path.join(chapters_root, item)
         
         # Only process directories that contain a .chapterconf file
         if os.path.isdir(full_path):
@@ -447,15 +503,210 @@ if __name__ == '__main__':
     # Sort top-level chapters
     top_level_chapters.sort(key=lambda x: x['order'])
 
+    return top_level_chapters
+
+def generate_all(root_dir: str, chapters_root: str):
+    """Generates all chapter indices, the inclusion lists and the master index."""
+    top_level_chapters = collect_top_level_chapters(chapters_root)
+
     # Process all chapters recursively and generate their index files
     for chapter in top_level_chapters:
-        chapter_path = os.path.join(CHAPTERS_ROOT, chapter['path_name'])
-        process_directory(ROOT_DIR, chapter_path, chapter['path_name'])
+        chapter_path = os.path.join(chapters_root, chapter['path_name'])
+        process_directory(root_dir, chapter_path, chapter['path_name'])
 
     # Generate the combined inclusion files based on the :content_destination: tag
-    generate_combined_includes(ROOT_DIR)
+    generate_combined_includes(root_dir)
         
     # Final step: Update the master index
-    update_master_index(ROOT_DIR, top_level_chapters)
+    update_master_index(root_dir, top_level_chapters)
+
+def find_chapter(directory: str, chapters_root: str) -> Optional[str]:
+    """
+    Returns the nearest directory at or above directory whose index is generated,
+    i.e. that has a .chapterconf and lies below a top-level chapter, or None.
+    """
+    relative_path = os.path.relpath(directory, chapters_root)
+    if relative_path == '.' or relative_path.startswith('..'):
+        return None
+
+    top_level_path = os.path.join(chapters_root, relative_path.split(os.sep)[0])
+    if not os.path.exists(os.path.join(top_level_path, '.chapterconf')):
+        return None
+
+    while not os.path.exists(os.path.join(directory, '.chapterconf')):
+        directory = os.path.dirname(directory)
+
+    return directory
+
+def regenerate_affected(root_dir: str, chapters_root: str, changed_paths: Set[str]):
+    """
+    Updates the in-memory metadata for the changed paths and regenerates only the
+    chapter indices, inclusion lists and master index that depend on them.
+    """
+    indices = {} # chapter directory -> regenerate sub-chapter indices as well
+    destinations = set()
+    master_changed = False
+    master_template_path = os.path.normpath(os.path.join(root_dir, MASTER_INDEX_FILE))
+
+    def mark_index(directory: Optional[str], recursive: bool = False):
+        if directory is not None:
+            indices[directory] = indices.get(directory, False) or recursive
+
+    for path in sorted(changed_paths):
+        name = os.path.basename(path)
+        parent = os.path.dirname(path)
+
+        # Ignore the files written by this script
+        if name == 'index.rst' or os.path.normpath(path) in GENERATED_FILES:
+            continue
+
+        if os.path.normpath(path) == master_template_path:
+            master_changed = True
+
+        elif is_ignored_path(path, chapters_root):
+            continue
+
+        elif name == '.chapterconf':
+            # The ignore globs may have changed, reload the metadata below this directory
+            for filepath in [filepath for filepath in METADATA if filepath.startswith(parent + os.sep)]:
+                metadata = METADATA.pop(filepath)
+                if metadata.get('destination_file'):
+                    destinations.add(metadata['destination_file'])
+            preload_metadata(parent, 1)
+            destinations.update(metadata['destination_file'] for filepath, metadata in METADATA.items()
+                                if filepath.startswith(parent + os.sep) and metadata.get('destination_file'))
+
+            # A chapter that never had an index also needs the indices of its sub-chapters
+            mark_index(find_chapter(parent, chapters_root), not os.path.exists(os.path.join(parent, 'index.rst')))
+            # The parent index links to (or merges) this directory
+            mark_index(find_chapter(os.path.dirname(parent), chapters_root))
+            if os.path.relpath(os.path.dirname(parent), chapters_root) == '.':
+                master_changed = True
+
+        elif os.path.isdir(path) or path in DIRECTORIES:
+            if os.path.isdir(path) == (path in DIRECTORIES):
+                # Only the modification time of a known directory changed
+                continue
+
+            if os.path.isdir(path):
+                # Files in the new directory are reported as changes of their own
+                DIRECTORIES.update(dirpath for dirpath, _, _ in os.walk(path))
+            else:
+                DIRECTORIES.difference_update([directory for directory in DIRECTORIES
+                                               if directory == path or directory.startswith(path + os.sep)])
+                for filepath in [filepath for filepath in METADATA if filepath.startswith(path + os.sep)]:
+                    metadata = METADATA.pop(filepath)
+                    if metadata.get('destination_file'):
+                        destinations.add(metadata['destination_file'])
+
+            mark_index(find_chapter(parent, chapters_root))
+            if os.path.relpath(parent, chapters_root) == '.':
+                master_changed = True
+
+        elif os.path.splitext(name)[1].lower() in ('.md', '.rst'):
+            old_metadata = METADATA.pop(path, None)
+            new_metadata = extract_metadata(path) if os.path.isfile(path) else None
+            if new_metadata is not None:
+                METADATA[path] = new_metadata
+
+            # Changes of the content only do not affect any generated file
+            if old_metadata == new_metadata:
+                continue
+
+            mark_index(find_chapter(parent, chapters_root))
+            for metadata in (old_metadata, new_metadata):
+                if metadata and metadata.get('destination_file'):
+                    destinations.add(metadata['destination_file'])
+
+    for directory, recursive in sorted(indices.items()):
+        if os.path.isdir(directory):
+            process_directory(root_dir, directory, os.path.relpath(directory, chapters_root), recursive)
+
+    if destinations:
+        generate_combined_includes(root_dir, destinations)
+
+    if master_changed:
+        update_master_index(root_dir, collect_top_level_chapters(chapters_root))
+
+    if not indices and not destinations and not master_changed:
+        print("⏩ No generated files affected.")
+
+def watch(root_dir: str, chapters_root: str, jobs: int, debounce: float, poll_interval: float):
+    """
+    Keeps the metadata of all files in memory and regenerates the affected files
+    whenever something below root_dir changes, until interrupted with Ctrl+C.
+    """
+    # Only needed in watch mode
+    from file_watcher import create_watcher, wait_for_changes, OVERFLOW
+
+    watcher = create_watcher(root_dir, poll_interval)
+    print(f"\n👀 Watching {root_dir} for changes ({type(watcher).__name__}), press Ctrl+C to stop.")
+
+    try:
+        while True:
+            changed_paths = wait_for_changes(watcher, debounce)
+            start = time.perf_counter()
+
+            if changed_paths is OVERFLOW:
+                print("⚠️ WARNING: File system events were lost. Regenerating everything.")
+                METADATA.clear()
+                DIRECTORIES.clear()
+                preload_metadata(chapters_root, jobs)
+                generate_all(root_dir, chapters_root)
+            else:
+                print(f"\n🔁 {len(changed_paths)} changed path(s)")
+                regenerate_affected(root_dir, chapters_root, changed_paths)
+
+            print(f"⏱️ Update finished in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except KeyboardInterrupt:
+        print("\n✅ Watch mode stopped.")
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate Sphinx TOCTREE indices recursively.")
+    parser.add_argument('--root-dir', type=str, default='.', 
+                        help="The root directory containing the source files (e.g., '.' or '/tmp/source').")
+    parser.add_argument('--chapters-dir', type=str, default='chapters')
+    parser.add_argument('--index-template', type=str, default='index_template.rst', 
+                        help="File to use as a top index template. Must contain a <<DYNAMIC_CHAPTER_LINKS>> line.")
+    parser.add_argument('--jobs', '-j', type=str, default='1',
+                        help="Number of worker threads used to extract metadata, or 'auto' for one per CPU (like sphinx-build -j).")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and regenerate the affected indices and include files when sources change.")
+    parser.add_argument('--debounce', type=float, default=0.2,
+                        help="Seconds without further changes before regenerating in watch mode.")
+    parser.add_argument('--poll-interval', type=float, default=0.5,
+                        help="Seconds between scans in watch mode if inotify is not available.")
+                       
+    args = parser.parse_args()
+    
+    ROOT_DIR = args.root_dir
+    CHAPTERS_SUB_DIR = args.chapters_dir
+    MASTER_INDEX_FILE = args.index_template
+    CHAPTERS_ROOT = os.path.join(ROOT_DIR, CHAPTERS_SUB_DIR)
+    
+    print(f"▶️ Sphinx Dynamic Chapter Generator Initiated (Root: {ROOT_DIR})")
+    
+    if not os.path.isdir(CHAPTERS_ROOT):
+        print(f"❌ Fatal Error: Chapter root directory not found: {CHAPTERS_ROOT}")
+        exit(1)
+
+    if args.jobs == 'auto':
+        JOBS = os.cpu_count() or 1
+    elif args.jobs.isdigit() and int(args.jobs) > 0:
+        JOBS = int(args.jobs)
+    else:
+        print(f"❌ Fatal Error: Invalid --jobs value: {args.jobs}")
+        exit(1)
+
+    # Extract all metadata up front so the recursive passes below only do lookups
+    preload_metadata(CHAPTERS_ROOT, JOBS)
+
+    generate_all(ROOT_DIR, CHAPTERS_ROOT)
     
-    print("\n✅ Generator Complete. ")
\ No newline at end of file
+    print("\n✅ Generator Complete. ")
+
+    if args.watch:
+        watch(ROOT_DIR, CHAPTERS_ROOT, JOBS, args.debounce, args.poll_interval)
\ No newline at end of file
@@ -2,10 +2,11 @@ from ensurepip import version
 import os
 import sys
 from pathlib import Path
-import glob
 
 sys.path.append(str(Path('extensions').resolve()))
 
+from static_paths import find_static_paths
+
 # --- Project information ---
 project = 'SphinxGen'
 copyright = '2025, erladion'
@@ -18,6 +19,9 @@ extensions = [
     'sphinx.ext.duration',
     'sphinx.ext.ifconfig',
     'env_config',
+    'ifconfig_dependencies',
+    'asset_sync',
+    'image_optimizer',
     'dynamic_handling'
 ]
 
@@ -53,38 +57,18 @@ should_include = True
 production_build = False
 
 def setup(app):
-    app.add_config_value('should_include', should_include, 'env')
-    app.add_config_value('production_build', production_build, 'env')
-
-def getDynamicStaticPaths():
-    # --- Dynamic html_static_path Configuration ---
-    conf_dir = Path(os.path.abspath(os.path.dirname(__file__)))
-    # Define the names of subfolders you want to treat as static asset directories
-    # e.g., 'images', 'assets', 'static'
-    static_folder_names = ['images', 'assets']
-
-    dynamic_static_paths = []
-    # Search for the specified folder names recursively in all subdirectories
-    for folder_name in static_folder_names:
-        # Use glob to find all folders with the target name
-        # '**/' means recursive search through subdirectories
-        search_pattern = str(conf_dir / '**' / folder_name)
-        
-        # glob.glob returns absolute paths, so we convert them back to 
-        # paths relative to conf_dir, as required by html_static_path
-        for found_path_abs in glob.glob(search_pattern, recursive=True):
-            found_path = Path(found_path_abs)
-            if found_path.is_dir():
-                # Get the path relative to conf_dir and add it as a string
-                relative_path = found_path.relative_to(conf_dir)
-                dynamic_static_paths.append(str(relative_path))
-    
-    return dynamic_static_paths
-
-html_static_path = ['_static'] + getDynamicStaticPaths()
-html_static_path = list(set(html_static_path))
-
-print(f"Sphinx found static paths: {html_static_path}")
+    # Documents using these in ifconfig are invalidated by ifconfig_dependencies
+    app.add_config_value('should_include', should_include, '')
+    app.add_config_value('production_build', production_build, '')
+
+# --- Chapter asset folders ---
+# Every 'images' and 'assets' folder below the chapters root is a static asset directory,
+# the folders are found once and cached until a directory below the chapters root changes.
+# Their files are synced into _static by asset_sync, only copying new and changed files.
+conf_dir = os.path.abspath(os.path.dirname(__file__))
+html_static_path = ['_static']
+asset_sync_paths = find_static_paths(conf_dir, dynamic_handling_options['chapters_dir'],
+                                     ['images', 'assets'], exclude_patterns)
 
 latex_elements = {
     'preamble': r'''
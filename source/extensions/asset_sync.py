@@ -0,0 +1,167 @@
+import os
+import json
+import shutil
+import hashlib
+from typing import Dict, List, Tuple
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = 'asset_sync_manifest.json'
+CHUNK_SIZE = 1024 * 1024
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def collect_assets(src_dir: str, folders: List[str]) -> Dict[str, List[str]]:
+    """
+    Maps every output name (path relative to _static) to the source files that would be
+    copied there, in the order of folders, like html_static_path does.
+    """
+    assets = {}
+
+    for folder in folders:
+        folder_path = os.path.join(src_dir, folder)
+        for dirpath, dirnames, filenames in os.walk(folder_path):
+            dirnames[:] = sorted(dirname for dirname in dirnames if not dirname.startswith('.'))
+            for filename in sorted(filenames):
+                if filename.startswith('.'):
+                    continue
+                source = os.path.join(dirpath, filename)
+                assets.setdefault(os.path.relpath(source, folder_path), []).append(source)
+
+    return assets
+
+def load_manifest(manifest_path: str) -> Dict[str, Dict]:
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def source_hash(source: str, previous: Dict[str, Dict], hashes: Dict[str, str]) -> Tuple[str, List[int]]:
+    """
+    Returns the content hash and stat data of a source file. The hash of the last sync
+    is reused when the size and modification time of the source did not change.
+    """
+    st = os.stat(source)
+    stat = [st.st_size, st.st_mtime_ns]
+
+    if source not in hashes:
+        known = previous.get(source)
+        hashes[source] = known['hash'] if known and known['stat'] == stat else file_hash(source)
+
+    return hashes[source], stat
+
+def place_file(source: str, destination: str, link: bool) -> str:
+    """Hardlinks (if link is set and possible) or copies source to destination, returns which one was done."""
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if os.path.lexists(destination):
+        os.remove(destination)
+
+    if link:
+        try:
+            os.link(source, destination)
+            return 'linked'
+        except OSError:
+            # Other file system or no hardlink support
+            pass
+
+    shutil.copy2(source, destination)
+    return 'copied'
+
+def sync_assets(app, exception):
+    """
+    Copies the files of the asset folders into _static. Only files that are new or whose
+    content changed since the last sync are placed, identical files are placed once and
+    linked, files no longer provided by any asset folder are removed again.
+    """
+    if exception is not None or app.builder.format != 'html' or not app.config.asset_sync_paths:
+        return
+
+    static_dir = os.path.join(app.outdir, '_static')
+    manifest_path = os.path.join(app.doctreedir, MANIFEST_FILE_NAME)
+    manifest = load_manifest(manifest_path)
+    link = app.config.asset_sync_hardlink
+
+    assets = collect_assets(app.srcdir, app.config.asset_sync_paths)
+    # Hashes by source path, every source is read at most once per sync
+    hashes = {}
+    previous_sources = {entry['source']: entry for entry in manifest.values()}
+
+    # Detect collisions before anything is written, the last folder wins like in html_static_path
+    plan = {}
+    for name, sources in sorted(assets.items()):
+        source = sources[-1]
+        digest, stat = source_hash(source, previous_sources, hashes)
+
+        different = sorted({os.path.relpath(other, app.srcdir) for other in sources
+                            if source_hash(other, previous_sources, hashes)[0] != digest})
+        if different:
+            logger.warning(f"Asset name collision in _static/{name}: using {os.path.relpath(source, app.srcdir)}, "
+                           f"ignoring {', '.join(different)}")
+
+        destination = os.path.join(static_dir, name)
+        if name not in manifest and os.path.exists(destination) and file_hash(destination) != digest:
+            # Not placed by an earlier sync, but by html_static_path or the theme
+            logger.warning(f"Asset _static/{name} collides with a static file of the project or theme, "
+                           f"not replacing it with {os.path.relpath(source, app.srcdir)}")
+            continue
+
+        plan[name] = {'source': source, 'hash': digest, 'stat': stat}
+
+    counts = {'copied': 0, 'linked': 0, 'unchanged': 0, 'removed': 0}
+    # First output file per content hash, later files with the same content are linked to it
+    placed = {}
+    changed = []
+
+    for name, entry in plan.items():
+        destination = os.path.join(static_dir, name)
+        known = manifest.get(name)
+
+        # Files with the same content that are not in the manifest yet (e.g. after removing
+        # the doctrees) are adopted as they are
+        if (known is None or known['hash'] == entry['hash']) and os.path.exists(destination):
+            counts['unchanged'] += 1
+            placed.setdefault(entry['hash'], destination)
+        else:
+            changed.append((destination, entry))
+
+    for destination, entry in changed:
+        if entry['hash'] in placed:
+            counts[place_file(placed[entry['hash']], destination, True)] += 1
+        else:
+            counts[place_file(entry['source'], destination, link)] += 1
+            placed[entry['hash']] = destination
+
+    for name in manifest.keys() - plan.keys():
+        destination = os.path.join(static_dir, name)
+        if os.path.exists(destination):
+            os.remove(destination)
+            counts['removed'] += 1
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(plan, f, indent=1)
+
+    logger.info(f"Asset sync: {counts['copied']} copied, {counts['linked']} linked, "
+                f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+
+def setup(app):
+    """
+    Registers the asset sync stage: the folders in 'asset_sync_paths' (relative to the
+    source directory) are synced into _static after the build instead of being copied
+    in full by html_static_path on every build.
+    """
+    app.add_config_value('asset_sync_paths', [], 'html')
+    app.add_config_value('asset_sync_hardlink', False, 'html')
+    app.connect('build-finished', sync_assets)
+
+    return {
+        'version': '1.0',
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
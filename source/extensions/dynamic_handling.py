@@ -1,34 +1,62 @@
 import os
 import re
-import yaml # Required for YAML front matter in MyST Markdown
-from docutils.parsers.rst import Directive
+import hashlib
+import functools
+from pathlib import Path
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from docutils.parsers.rst import Directive, directives
 from docutils import nodes
+from docutils.statemachine import StringList
+from sphinx.directives.other import Include, TocTree
 from sphinx.util import logging
-from typing import Dict, List, Any
-
+from sphinx.util.matching import Matcher
+from typing import Callable, Dict, List, Any, Optional
+from metadata_cache import MetadataCache
+from generation_stats import GenerationStats
+from generation_profiler import GenerationProfiler, resolve_mode
+from metadata_parser import read_metadata_block, parse_block, RST_DIRECTIVE, FRONT_MATTER, FENCE
+from chapter_tree import ContentFile, TreeDirectory, scan_tree, iter_directories, iter_files
 
 class MetadataDirective(Directive):
     """
-    Parses a YAML block of custom metadata (order, content destination, etc.)
-    and stores it in a custom Docutils node for the generator script to read.
+    Attaches the custom metadata (order, content destination, etc.) of the file to a
+    custom Docutils node. The metadata parsed during the scan in builder-inited is
+    reused, the block is only parsed again for files the scan did not see. The scan
+    result is also recorded in the environment, so the scan of the next build can
+    trust it for unchanged documents.
     """
     has_content = True
     required_arguments = 0
     optional_arguments = 0
     final_argument_whitespace = False
 
+    option_spec = {
+        'content_order' : directives.nonnegative_int,
+        'content_title' : directives.unchanged,
+        'content_destination' : directives.unchanged
+    }
+
     def run(self):
-        try:
-            # Parse the content block as YAML
-            metadata = yaml.safe_load("\n".join(self.content))
-            if not metadata:
-                metadata = {}
-        except Exception as e:
-            error = self.state_machine.reporter.error(
-                f'Error parsing custom metadata YAML: {e}',
-                nodes.literal_block(self.block_text, self.block_text), line=self.lineno
-            )
-            return [error]
+        # The source of the directive itself, which differs from the document for included files
+        source, _ = self.state_machine.get_source_and_line(self.lineno)
+        source_path = os.path.normpath(os.path.abspath(source)) if source else None
+        scanned = SCAN_METADATA.get(source_path)
+
+        if scanned is not None:
+            metadata = metadata_fields(scanned)
+            record_document_metadata(self.state.document.settings.env, source_path, scanned)
+        else:
+            try:
+                # Not seen by the scan, parse the block (YAML only for complex values)
+                metadata = parse_block(list(self.content))
+                metadata.update(self.options)
+            except Exception as e:
+                error = self.state_machine.reporter.error(
+                    f'Error parsing custom metadata YAML: {e}',
+                    nodes.literal_block(self.block_text, self.block_text), line=self.lineno
+                )
+                return [error]
 
         # Create a custom Docutils node to hold the metadata data.
         # This node will be ignored by the final HTML builder but is visible 
@@ -38,6 +66,76 @@ class MetadataDirective(Directive):
         # Ensure the node is included in the document structure
         return [metadata_node]
 
+class DynamicInclude(Include):
+    """
+    Include directive that serves the inclusion lists of the 'virtual' include mode
+    from memory instead of from disk, and registers the fragments of persistent
+    inclusion lists as dependencies of the including document. Any other file is
+    included as usual.
+    """
+
+    def run(self):
+        if self.arguments[0].startswith('<') and self.arguments[0].endswith('>'):
+            return super().run()
+
+        _, filename = self.env.relfn2path(self.arguments[0])
+        virtual = VIRTUAL_INCLUDES.get(os.path.normpath(filename))
+        if virtual is None:
+            # Editing a fragment of a persistent inclusion list re-reads the includer
+            for fragment_path in PERSISTENT_INCLUDES.get(os.path.normpath(filename), ()):
+                self.env.note_dependency(fragment_path)
+            return super().run()
+
+        dest_file_base, text = virtual
+        record_virtual_include(self.env, dest_file_base)
+
+        # Listeners of include-read see the generated text like that of a file
+        content = [text]
+        self.env.events.emit('include-read', Path(os.path.relpath(filename, self.env.srcdir)), self.env.docname, content)
+
+        self.state_machine.insert_input(content[0].splitlines() + [''], str(filename))
+        return []
+
+class DynamicTocTree(TocTree):
+    """
+    Renders the toctree of a chapter directory from the tree model built in
+    builder-inited, with the same entries as the generated chapter index. The
+    chapter defaults to the directory of the document, all toctree options apply.
+    """
+    option_spec = dict(TocTree.option_spec, chapter=directives.unchanged_required)
+
+    def run(self):
+        docname = self.env.docname
+        if 'chapter' in self.options:
+            _, chapter_path = self.env.relfn2path(self.options['chapter'])
+        else:
+            chapter_path = os.path.dirname(self.env.doc2path(docname))
+
+        directory = None
+        if CHAPTERS_TREE is not None:
+            directory = CHAPTERS_TREE.find(os.path.relpath(chapter_path, CHAPTERS_TREE.path))
+
+        if directory is None:
+            error = self.state_machine.reporter.error(
+                f'Chapter directory not found below the chapters root: {chapter_path}',
+                nodes.literal_block(self.block_text, self.block_text), line=self.lineno
+            )
+            return [error]
+
+        # Entries link to absolute docnames, so the directive works from any document
+        chapter_docname = os.path.relpath(directory.path, self.env.srcdir).replace(os.sep, '/')
+        entries = []
+        chapter_entries = toc_entries(directory)
+        for entry in chapter_entries:
+            target = f"{chapter_docname}/{entry.link_path}"
+            if target != docname:
+                entries.append(f"{entry.title} </{target}>" if entry.title != entry.link_path else f"/{target}")
+
+        record_toctree_chapter(self.env, os.path.relpath(directory.path, CHAPTERS_TREE.path), directory_signature(directory, chapter_entries))
+
+        self.content = StringList(entries, self.state_machine.document.current_source)
+        return super().run()
+
 # Define a custom node class to hold the metadata dictionary
 # This is a standard Docutils approach for custom data.
 class metadata_node_class(nodes.General, nodes.Element):
@@ -53,21 +151,142 @@ class MetadataEndDirective(Directive):
 
 logger = logging.getLogger(__name__)
 
-# We will define them dynamically in the main function based on the passed root.
 MASTER_INDEX_FILE = 'index_template.rst'
 PLACEHOLDER = '<<DYNAMIC_CHAPTER_LINKS>>'
 CHAPTERS_SUB_DIR = 'chapters'
 GENERATED_INCLUDES_EXTENSION = '.rst'
-FILES_TO_CLEANUP=[]
+# Temporary inclusion lists of the current build, deleted in cleanup
+FILES_TO_CLEANUP = set()
+WRITE_STATS = {'written': 0, 'unchanged': 0}
+METADATA_CACHE = None
+JOBS = 1
+SCAN_WORKERS = 0
+CACHE_FILE_NAME = 'dynamic_handling_cache.json'
+# Signatures of the inputs of every generated file, the snapshot of the previous
+# build is stored in the Sphinx environment and used to skip unchanged output.
+# 'outputs' holds the (size, mtime_ns) of every file as last written, by path
+PREVIOUS_SNAPSHOT = {'settings': None, 'indices': {}, 'includes': {}, 'master': {}, 'outputs': {}}
+SNAPSHOT = {'settings': None, 'indices': {}, 'includes': {}, 'master': {}, 'outputs': {}}
+SKIP_STATS = {'skipped': 0, 'total': 0}
+# Generated index files whose inputs changed, reported to Sphinx as outdated
+OUTDATED_INDICES = set()
+# Timers and counters of the current generation run
+STATS = GenerationStats()
+# How inclusion lists are provided: written before and deleted after the build
+# (temporary), kept on disk across builds (persistent) or served from memory by the
+# include directive (virtual)
+TEMPORARY = 'temporary'
+PERSISTENT = 'persistent'
+VIRTUAL = 'virtual'
+INCLUDE_MODES = (TEMPORARY, PERSISTENT, VIRTUAL)
+INCLUDE_MODE = TEMPORARY
+# Inclusion lists of the virtual include mode: normalized path -> (destination, text)
+VIRTUAL_INCLUDES = {}
+# Fragments of the persistent inclusion lists: normalized path -> fragment paths
+PERSISTENT_INCLUDES = {}
+# Tree model of the chapters root, read by the dynamic-toctree directive
+CHAPTERS_TREE = None
+# Metadata of every content file found by the scan, by normalized absolute path
+SCAN_METADATA = {}
+# Metadata recorded in the environment by the metadata directive in the previous
+# build, by normalized absolute path, see record_document_metadata
+ENV_METADATA = {}
+# Set while profiling is enabled through the 'profile' option or the environment variable
+PROFILER = None
+PROFILE_ENV_VAR = 'DYNAMIC_HANDLING_PROFILE'
+
+def signature(*parts: Any) -> str:
+    """Stable digest of the given (repr-able) parts, used to detect changed generator inputs."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+def directory_signature(directory: TreeDirectory, entries: Optional[List['TocEntry']] = None) -> str:
+    """
+    Digest of what the index of a chapter directory renders: its title and the sorted
+    toctree entries (pass them if already collected). Fragments tagged with
+    content_destination are not listed, they are dependencies of their includers.
+    """
+    if entries is None:
+        entries = toc_entries(directory)
+
+    title = directory.config['title'] if directory.config else None
+    return signature(directory.name, title, entries)
+
+def docname_of(root_dir: str, file_path: str) -> str:
+    """Sphinx docname of a file below the source directory."""
+    return os.path.splitext(os.path.relpath(file_path, root_dir))[0].replace(os.sep, '/')
+
+def is_unchanged(kind: str, key: str, digest: str, output_path: str) -> bool:
+    """
+    Records the digest of an output file and returns True if it can be skipped this build,
+    i.e. its inputs are unchanged and the file is still as last written (not edited,
+    truncated or removed). Chapter and master indices with changed inputs are marked
+    for re-reading by Sphinx.
+    """
+    SNAPSHOT[kind][key] = digest
+    SKIP_STATS['total'] += 1
+
+    # Virtual inclusion lists (no output_path) only exist in memory
+    if PREVIOUS_SNAPSHOT[kind].get(key) == digest and (output_path is None or is_as_written(output_path)):
+        if output_path is not None:
+            SNAPSHOT['outputs'][os.path.normpath(output_path)] = PREVIOUS_SNAPSHOT['outputs'][os.path.normpath(output_path)]
+        SKIP_STATS['skipped'] += 1
+        STATS.count('includes_skipped' if kind == 'includes' else 'indices_skipped')
+        return True
+
+    if kind in ('indices', 'master'):
+        OUTDATED_INDICES.add(output_path)
+
+    return False
+
+def output_stat(file_path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def is_as_written(file_path: str) -> bool:
+    """True if the file has the size and modification time recorded when it was last written."""
+    recorded = PREVIOUS_SNAPSHOT.get('outputs', {}).get(os.path.normpath(file_path))
+    return recorded is not None and output_stat(file_path) == recorded
+
+def write_if_changed(file_path: str, content: str) -> bool:
+    """
+    Writes content to file_path only if it differs from what is already on disk.
+    Leaving unchanged files untouched keeps their mtime, so Sphinx does not
+    consider the generated document outdated. Returns True if the file was written.
+    The stat data of the file is recorded either way, see is_as_written.
+    """
+    written = write_content(file_path, content)
+    SNAPSHOT['outputs'][os.path.normpath(file_path)] = output_stat(file_path)
+    return written
+
+def write_content(file_path: str, content: str) -> bool:
+    new_bytes = content.encode('utf-8')
+
+    try:
+        if os.path.getsize(file_path) == len(new_bytes):
+            with open(file_path, 'rb') as f:
+                old_digest = hashlib.sha256(f.read()).digest()
+                STATS.file_read(f)
+
+            if old_digest == hashlib.sha256(new_bytes).digest():
+                WRITE_STATS['unchanged'] += 1
+                return False
+    except OSError:
+        # Missing or unreadable file, (re)write it
+        pass
+
+    with open(file_path, 'wb') as f:
+        f.write(new_bytes)
+
+    WRITE_STATS['written'] += 1
+    return True
 
 def read_chapter_config(path: str) -> Dict[str, Any]:
     """Reads the .chapterconf for title and order."""
     config_path = os.path.join(path, '.chapterconf') 
     
-    if not os.path.exists(config_path):
-        # This is okay if a directory doesn't need to be part of the navigation
-        return None
-    
     config = {'order': 9999, 'title': None}
     order_pattern = re.compile(r'^order\s*=\s*(\d+)', re.MULTILINE)
     title_pattern = re.compile(r'^title\s*=\s*(.*)', re.MULTILINE)
@@ -75,27 +294,33 @@ def read_chapter_config(path: str) -> Dict[str, Any]:
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            
-            order_match = order_pattern.search(content)
-            if order_match:
-                config['order'] = int(order_match.group(1))
-            else:
-                logger.warning(f"  ⚠️ WARNING: Missing 'order=' in config file: {config_path}. Defaulting to 9999.")
-
-            title_match = title_pattern.search(content)
-            if title_match:
-                config['title'] = title_pattern.search(content).group(1).strip()
-            else:
-                logger.warning(f"  ⚠️ WARNING: Missing 'title=' in config file: {config_path}. Using folder name.")
-
+            STATS.file_read(f)
+    except FileNotFoundError:
+        # This is okay if a directory doesn't need to be part of the navigation
+        return None
     except Exception as e:
+        STATS.warn('chapter_config')
         logger.error(f"  ❌ ERROR: Failed to read config {config_path}: {e}")
         return None
+
+    order_match = order_pattern.search(content)
+    if order_match:
+        config['order'] = int(order_match.group(1))
+    else:
+        STATS.warn('chapter_config')
+        logger.warning(f"  ⚠️ WARNING: Missing 'order=' in config file: {config_path}. Defaulting to 9999.")
+
+    title_match = title_pattern.search(content)
+    if title_match:
+        config['title'] = title_match.group(1).strip()
+    else:
+        STATS.warn('chapter_config')
+        logger.warning(f"  ⚠️ WARNING: Missing 'title=' in config file: {config_path}. Using folder name.")
         
     return config
 
-def extract_md_metadata(filepath: str) -> Dict[str, Any]:
-    """Reads metadata (order and title) from YAML front matter in a Markdown file."""
+def extract_md_metadata(filepath: str, text: Optional[str] = None) -> Dict[str, Any]:
+    """Reads metadata (order and title) from YAML front matter in a Markdown file, or from text if already read."""
     metadata = {
         'order': 9999,
         'title': None,
@@ -104,39 +329,33 @@ def extract_md_metadata(filepath: str) -> Dict[str, Any]:
     }
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Regex to find the YAML front matter block (must be at the start)
-        yaml_match = re.match(r'---\s*\n(.*?)\n---', content, re.DOTALL)
-        
-        if not yaml_match:
-            logger.verbose(f"  ℹ️ INFO: Could not find a YAML style metadata block, trying rst style {filepath}.")        
-            metadata = extract_rst_metadata(filepath)
+        # YAML front matter (must be at the start) or a {metadata} fenced block
+        data = read_metadata_block(filepath, (FRONT_MATTER, FENCE), stats=STATS, text=text)
+        if data is None:
+            raise ValueError("No front matter or {metadata} block found")
+
+        if isinstance(data.get('content_order'), int):
+            metadata['order'] = data.get('content_order')
+            metadata['valid'] = True
         else:
-            # Parse the YAML content
-            data = yaml.safe_load(yaml_match.group(1)) or {}
-
-            if isinstance(data.get('content_order'), int):
-                metadata['order'] = data.get('content_order')
-                metadata['valid'] = True
-            else:
-                logger.warning(f"  ⚠️ WARNING: Missing or non-integer 'content_order' in {filepath}. Defaulting to 9999.")
-                metadata['valid'] = False # Must have order to be linked
+            STATS.warn('metadata')
+            logger.warning(f"  ⚠️ WARNING: Missing or non-integer 'content_order' in {filepath}. Defaulting to 9999.")
+            metadata['valid'] = False # Must have order to be linked
 
-            if isinstance(data.get('content_title'), str):
-                metadata['title'] = data.get('content_title').strip()
+        if isinstance(data.get('content_title'), str):
+            metadata['title'] = data.get('content_title').strip()
 
-            if isinstance(data.get('content_destination'), str):
-                metadata['destination_file'] = data.get('content_destination').strip()       
+        if isinstance(data.get('content_destination'), str):
+            metadata['destination_file'] = data.get('content_destination').strip()
     except Exception as e:
+        STATS.warn('metadata')
         logger.error(f"  ❌ ERROR: Failed to read Markdown metadata from {filepath}: {e}")
         metadata['valid'] = False
 
     return metadata    
 
-def extract_rst_metadata(filepath: str) -> Dict[str, Any]:
-    """Reads metadata (order and title) from the field list at the top of an RST file."""
+def extract_rst_metadata(filepath: str, text: Optional[str] = None) -> Dict[str, Any]:
+    """Reads metadata (order and title) from the field list at the top of an RST file, or from text if already read."""
     metadata = {
         'order': 9999,  # Default to last position if missing
         'title': None,
@@ -144,161 +363,279 @@ def extract_rst_metadata(filepath: str) -> Dict[str, Any]:
         'valid': True  # Flag to track successful extraction of ORDER
     }
 
-    metadata_yaml_pattern = re.compile(
-        r'^\.\.\s*metadata::\s*\n'
-        r'(.*?)'
-        r'(?=\n\S|\Z)',
-        re.DOTALL | re.MULTILINE
-    )
-
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            head_content = f.read(1000)
-
-            yaml_match = metadata_yaml_pattern.search(head_content)
-
-            if yaml_match:
-                yaml_content = yaml_match.group(1)
+        data = read_metadata_block(filepath, (RST_DIRECTIVE,), stats=STATS, text=text)
 
-                first_line = [line for line in yaml_content.splitlines() if line.strip()][0]
-                indent = len(first_line) - len(first_line.lstrip())
+        if data is not None:
+            metadata['order'] = data.get('content_order', 9999)
+            metadata['title'] = data.get('content_title')
+            metadata['destination_file'] = data.get('content_destination')
 
-                unindented_content = re.sub(r'^\s{' + str(indent) + '}', '', yaml_content, flags=re.MULTILINE)
-                data = yaml.safe_load(unindented_content) or {}
-                data = {key.lstrip(':'): value for key, value in data.items()}
-
-                metadata['order'] = data.get('content_order', 9999)
-                metadata['title'] = data.get('content_title')
-                metadata['destination_file'] = data.get('content_destination')
-
-                if metadata['order'] == 9999:
-                    logger.warning(f"  ⚠️ WARNING: Missing ':content_order:' in {filepath}. Defaulting to order 9999.")
-                    metadata['valid'] = False
+            if metadata['order'] == 9999:
+                STATS.warn('metadata')
+                logger.warning(f"  ⚠️ WARNING: Missing ':content_order:' in {filepath}. Defaulting to order 9999.")
+                metadata['valid'] = False
     except Exception as e:
+        STATS.warn('metadata')
         logger.error(f"  ❌ ERROR: Failed to read RST metadata from {filepath}: {e}")
         metadata['valid'] = False
 
     return metadata
 
-def process_directory(root_dir: str, directory_path: str, chapter_relative_path: str = '') -> List[Dict[str, Any]]:
+def file_stat(filepath: str) -> List[int]:
+    st = os.stat(filepath)
+    return [st.st_size, st.st_mtime_ns]
+
+def metadata_fields(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Turns scanned metadata back into the fields of the metadata block."""
+    fields = {}
+    if metadata['order'] != 9999:
+        fields['content_order'] = metadata['order']
+    if metadata['title'] is not None:
+        fields['content_title'] = metadata['title']
+    if metadata['destination_file'] is not None:
+        fields['content_destination'] = metadata['destination_file']
+    return fields
+
+def record_document_metadata(env, source_path: str, metadata: Dict[str, Any]):
     """
-    Recursively scans a directory for content files (.md/.rst) and sub-chapter 
-    directories (.chapterconf), generates the index.rst for the current 
-    directory, and returns the sorted list of items.
+    Stores the scanned metadata of the document being read in the environment, together
+    with the stat data of its source. Included files are recorded by their own document.
     """
-    if not os.path.isdir(directory_path):
-        return []
+    if os.path.normpath(os.path.abspath(env.doc2path(env.docname))) != source_path:
+        return
 
-    logger.verbose(f"🔨 Processing directory: {directory_path}")
-    
-    items_to_link = []
-    
-    # Scan directory and collect metadata
-    for item in sorted(os.listdir(directory_path)):
-        full_path = os.path.join(directory_path, item)
-        relative_path_name = os.path.join(chapter_relative_path, item)
-
-        item_data = {
-            'order': 9999,
-            'title': None,
-            'link_path': None,  # What to put in the toctree link
-            'issues': False
+    if not hasattr(env, 'dynamic_handling_metadata'):
+        env.dynamic_handling_metadata = {}
+
+    try:
+        env.dynamic_handling_metadata[env.docname] = {
+            'path': os.path.relpath(source_path, env.srcdir),
+            'stat': file_stat(source_path),
+            'metadata': dict(metadata)
         }
+    except OSError:
+        pass
+
+def record_virtual_include(env, dest_file_base: str):
+    """Remembers that the document being read includes the virtual inclusion list dest_file_base."""
+    if not hasattr(env, 'dynamic_handling_includes'):
+        env.dynamic_handling_includes = {}
+
+    env.dynamic_handling_includes.setdefault(env.docname, set()).add(dest_file_base)
+
+def record_toctree_chapter(env, key: str, digest: str):
+    """Remembers the chapter (relative to the chapters root) rendered by a dynamic-toctree of the document being read."""
+    if not hasattr(env, 'dynamic_handling_toctrees'):
+        env.dynamic_handling_toctrees = {}
+
+    env.dynamic_handling_toctrees.setdefault(env.docname, {})[key] = digest
+
+def cached_metadata(filepath: str, extract: Callable[..., Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Returns the metadata of a content file. Metadata recorded by the metadata directive
+    in the previous build is used if the document is unchanged, otherwise the
+    persistent cache is consulted and the file is only parsed if that is stale.
+    """
+    entry = ENV_METADATA.get(os.path.normpath(filepath))
+    if entry is not None:
+        try:
+            if entry['stat'] == file_stat(filepath):
+                STATS.count('metadata_from_env')
+                if METADATA_CACHE is not None:
+                    METADATA_CACHE.keep(filepath)
+                return dict(entry['metadata'])
+        except OSError:
+            pass
+
+    if METADATA_CACHE is None:
+        return extract(filepath)
+
+    return METADATA_CACHE.get(filepath, extract)
+
+def resolve_jobs(value: Any, default: int = 1) -> int:
+    """Turns a jobs setting (int, numeric string or 'auto') into a worker count."""
+    if value in (None, ''):
+        return max(1, default or 1)
+
+    if value == 'auto':
+        return os.cpu_count() or 1
+
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        STATS.warn('options')
+        logger.warning(f"  ⚠️ WARNING: Invalid 'jobs' value {value!r}. Defaulting to {default}.")
+        return max(1, default or 1)
+
+def resolve_scan_workers(value: Any) -> int:
+    """Turns a scan_workers setting into a thread count, 0 (sequential scan) if unset or invalid."""
+    if value in (None, ''):
+        return 0
+
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        workers = -1
 
+    if workers < 0:
+        STATS.warn('options')
+        logger.warning(f"  ⚠️ WARNING: Invalid 'scan_workers' value {value!r}. Scanning sequentially.")
+        return 0
+
+    return workers
+
+def extract_file_metadata(content_file: ContentFile) -> Dict[str, Any]:
+    """Extracts the metadata of a single content file of the tree model."""
+    if os.path.splitext(content_file.name)[1].lower() == '.md':
+        return cached_metadata(content_file.path, extract_md_metadata)
+
+    return cached_metadata(content_file.path, extract_rst_metadata)
+
+def load_tree_metadata(tree: TreeDirectory):
+    """
+    Reads every .chapterconf and content file metadata in the tree model exactly once.
+    The files are read through a thread pool when JOBS > 1 (or SCAN_WORKERS for
+    high latency file systems), the results are assigned back in scan order so
+    the generated toctrees stay deterministic. Generated index files carry no
+    metadata and are skipped.
+    """
+    index_name = f"index{GENERATED_INCLUDES_EXTENSION}"
+    chapters = [directory for directory in iter_directories(tree) if directory.is_chapter]
+    content_files = [content_file for content_file in iter_files(tree) if content_file.name != index_name]
+    workers = max(JOBS, SCAN_WORKERS)
+
+    logger.verbose(f"🔍 Extracting metadata from {len(content_files)} files using {workers} worker(s)")
+
+    if workers > 1 and len(chapters) + len(content_files) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            configs = executor.map(read_chapter_config, [directory.path for directory in chapters])
+            results = executor.map(extract_file_metadata, content_files)
+            configs, results = list(configs), list(results)
+    else:
+        configs = [read_chapter_config(directory.path) for directory in chapters]
+        results = [extract_file_metadata(content_file) for content_file in content_files]
+
+    for directory, config in zip(chapters, configs):
+        directory.config = config
+
+    for content_file, metadata in zip(content_files, results):
+        content_file.metadata = metadata
+        SCAN_METADATA[os.path.normpath(content_file.path)] = metadata
+
+def remove_inclusion_lists(tree: TreeDirectory, root_dir: str, destinations: set):
+    """Removes the inclusion list files of the given destinations from the tree model."""
+    paths = {os.path.normpath(os.path.join(root_dir, f"{destination}{GENERATED_INCLUDES_EXTENSION}")) for destination in destinations}
+
+    for directory in iter_directories(tree):
+        directory.children = [child for child in directory.children
+                              if isinstance(child, TreeDirectory) or os.path.normpath(child.path) not in paths]
+
+TocEntry = namedtuple('TocEntry', ['order', 'title', 'link_path', 'issues'])
+
+def collect_toc_entries(directory: TreeDirectory, prefix: str = '') -> List[TocEntry]:
+    """
+    Collects the unsorted toctree entries of a chapter directory. Content of container
+    folders (no .chapterconf) is merged in, with link paths built once relative to
+    the chapter index by extending the prefix per container level.
+    """
+    entries = []
+    index_name = f"index{GENERATED_INCLUDES_EXTENSION}"
+
+    for child in directory.children:
         # Sub chapter folders (Requires .chapterconf)
-        if os.path.isdir(full_path):
-            config = read_chapter_config(full_path)
-            
-            # Recursively process the sub-chapter first
-            sub_chapter_content = process_directory(root_dir, full_path, relative_path_name)
-
-            if config:    
-                # Use the config data for linking in the parent index
-                item_data.update({
-                    'order': config['order'],
-                    'title': config['title'] or item,
-                    # Link to the generated index file inside the folder
-                    'link_path': f"{item}/index"
-                })
-                items_to_link.append(item_data)
+        if isinstance(child, TreeDirectory):
+            if child.config:
+                # Link to the generated index file inside the folder
+                entries.append(TocEntry(child.config['order'], child.config['title'] or child.name, f"{prefix}{child.name}/index", False))
             else:
-                logger.verbose(f"  📂 Merging content from container folder: {full_path}")
-
-                # Append all files found in the subfolder (which are returned by the recursive call)
-                # The 'link_path' for these items must be made RELATIVE TO THE CURRENT INDEX.RST.                
-                for sub_item in sub_chapter_content:
-                    # Adjust the link_path to be relative to the *current* directory_path index.rst
-                    # e.g., if current index is chapter_A/index.rst, and the sub_item link is chapter_A_Sub/file,
-                    # the new link path must be chapter_A_Sub/file
-                    if sub_item['link_path']:
-                        sub_item['link_path'] = os.path.join(item, sub_item['link_path'])
-                        items_to_link.append(sub_item)
-
-        # Content file (.md or .rst)
-        elif item != 'index.rst':
-            file_extension = os.path.splitext(item)[1].lower()
-            
-            metadata = None
-            if file_extension == '.md':
-                metadata = extract_md_metadata(full_path)
-            elif file_extension == '.rst':
-                metadata = extract_rst_metadata(full_path)
-                
-            if metadata:
-                if metadata.get('destination_file'):
-                    logger.verbose(f"  ⏩ Skipping {item}: Tagged for inclusion (:content_destination: found).")
-                    continue
-
-                if not metadata['valid']:
-                    item_data['issues'] = True
-
-                # Link to the filename base (no extension, relative to current index)
-                filename_base = os.path.splitext(item)[0]
-                item_data.update({
-                    'order': metadata['order'],
-                    'title': metadata['title'] or filename_base,
-                    'link_path': filename_base
-                })
-                items_to_link.append(item_data)
-        
-    # Sort items
-    items_to_link.sort(key=lambda x: x['order'])
+                logger.verbose(f"  📂 Merging content from container folder: {child.path}")
+                entries.extend(collect_toc_entries(child, f"{prefix}{child.name}/"))
+
+        # Content file (.md or .rst), metadata has already been collected
+        elif child.name != index_name and child.valid is not None:
+            if child.destination:
+                logger.verbose(f"  ⏩ Skipping {child.name}: Tagged for inclusion (:content_destination: found).")
+                continue
+
+            # Link to the filename base (no extension, relative to the chapter index)
+            filename_base = os.path.splitext(child.name)[0]
+            entries.append(TocEntry(child.order, child.title or filename_base, prefix + filename_base, not child.valid))
+
+    return entries
+
+def process_directory(root_dir: str, directory: TreeDirectory):
+    """
+    Walks a directory of the tree model and every directory below it, and generates
+    the index.rst of each sub-chapter directory (.chapterconf).
+    """
+    for node in iter_directories(directory):
+        logger.verbose(f"🔨 Processing directory: {node.path}")
+
+        if node.config:
+            index_path = os.path.join(node.path, f"index{GENERATED_INCLUDES_EXTENSION}")
+            key = os.path.relpath(node.path, root_dir)
+
+            entries = toc_entries(node)
+            if is_unchanged('indices', key, directory_signature(node, entries), index_path):
+                logger.verbose(f"  ⏩ Index inputs unchanged since last build: {os.path.relpath(index_path, root_dir)}")
+                continue
+
+            write_chapter_index(root_dir, node, entries)
+        else:
+            logger.verbose(f"  ⏩ Skipping index generation for container directory: {node.path}")
+
+def toc_entries(directory: TreeDirectory) -> List[TocEntry]:
+    """The toctree entries of a chapter directory, sorted by order."""
+    items_to_link = collect_toc_entries(directory)
+    items_to_link.sort(key=lambda x: x.order)
+    return items_to_link
+
+def write_chapter_index(root_dir: str, directory: TreeDirectory, items_to_link: Optional[List[TocEntry]] = None):
+    """Generates the index.rst of a chapter directory from its sorted entries, collected here if not given."""
+    directory_path = directory.path
+    if items_to_link is None:
+        items_to_link = toc_entries(directory)
 
     # Generate toctree content
     toctree_entries = []
     issues_found = False
     
     for item in items_to_link:
-        if item['issues']:
+        if item.issues:
             issues_found = True
             
-        display_title = item['title']
-        link_path = item['link_path']
+        display_title = item.title
+        link_path = item.link_path
 
-        # Note: Indentation (3 spaces) for links inside chapter index is added here
         if display_title and display_title != link_path:
-            toctree_entries.append(f"   {display_title} <{link_path}>")
+            toctree_entries.append(f"{display_title} <{link_path}>")
         else:
-            # Simple syntax: just the path (Sphinx uses the document's internal title)
-            toctree_entries.append(f"   {link_path}")
+            toctree_entries.append(f"{link_path}")
+
+    if GENERATED_INCLUDES_EXTENSION == ".rst":
+        toctree_entries = ["   " + entry for entry in toctree_entries]
             
     # Write index.rst file
-    # Read the title from the chapterconf if it exists (for prettier header)
-    root_config = read_chapter_config(directory_path)
-
-    if root_config:
-        # Get the title for the index file from the last part of the path
-        chapter_title = os.path.basename(directory_path)
-        if root_config['title']:
-            chapter_title = root_config['title']
-        
-        # The parent index file path (e.g., source/chapters/my_chapter/index.rst)
-        index_path = os.path.join(directory_path, 'index.rst')
-        
-        # Create header and toctree content
-        header = f"{chapter_title}\n{'=' * len(chapter_title)}\n\n"
+    # Use the title from the chapterconf if it exists (for prettier header)
+    chapter_title = directory.config['title'] or directory.name
+    
+    # The parent index file path (e.g., source/chapters/my_chapter/index.rst)
+    index_path = os.path.join(directory_path, f"index{GENERATED_INCLUDES_EXTENSION}")
+    
+    # Create header and toctree content
+    header = f"{chapter_title}\n{'=' * len(chapter_title)}\n\n"
 
-        # Ensure a blank line separates the options from the links
+    # Ensure a blank line separates the options from the links
+    if GENERATED_INCLUDES_EXTENSION == ".md":
+        toctree_content = (
+            "```{toctree}\n"
+            ":maxdepth: 2\n"
+            f":caption: {chapter_title} Content:\n\n"
+            + "\n".join(toctree_entries) + "\n"
+            "```"
+        )
+    else:
         toctree_content = (
             ".. toctree::\n"
             "   :maxdepth: 2\n"
@@ -306,17 +643,15 @@ def process_directory(root_dir: str, directory_path: str, chapter_relative_path:
             + "\n".join(toctree_entries) + "\n"
         )
 
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(header)
-            f.write(toctree_content)
-
+    if write_if_changed(index_path, header + toctree_content):
+        STATS.count('indices_written')
         logger.verbose(f"  ✨ Index generated: {os.path.relpath(index_path, root_dir)} ({len(items_to_link)} links)")
-        if issues_found:
-            logger.info(f"  ⚠️ REVIEW REQUIRED: Issues found in files in {directory_path}.")
     else:
-        logger.verbose(f"  ⏩ Skipping index generation for container directory: {directory_path}")
-
-    return items_to_link
+        STATS.count('indices_unchanged')
+        logger.verbose(f"  ⏩ Index unchanged: {os.path.relpath(index_path, root_dir)} ({len(items_to_link)} links)")
+    if issues_found:
+        STATS.warn('review_required')
+        logger.info(f"  ⚠️ REVIEW REQUIRED: Issues found in files in {directory_path}.")
 
 def update_master_index(root_dir: str, all_chapters: List[Dict[str, Any]]):
     """
@@ -326,16 +661,16 @@ def update_master_index(root_dir: str, all_chapters: List[Dict[str, Any]]):
     # Define paths relative to the passed root_dir
     index_file_exists = False
     if MASTER_INDEX_FILE is None:
-        MASTER_INDEX_TEMPLATE_PATH = os.path.join(root_dir, MASTER_INDEX_FILE) 
-        index_file_exists = os.path.exists(MASTER_INDEX_TEMPLATE_PATH)    
+        master_index_template_path = os.path.join(root_dir, MASTER_INDEX_FILE)
+        index_file_exists = os.path.exists(master_index_template_path)
     
-    MASTER_INDEX_PATH = os.path.join(root_dir, 'index.rst')
+    master_index_path = os.path.join(root_dir, f"index{GENERATED_INCLUDES_EXTENSION}")
     
     # Links point to the index.rst files we generated in each top-level chapter folder.
     # We use the chapter folder name (path_name) and the constant CHAPTERS_SUB_DIR
     master_toctree_entries = "\n".join([
         # Indentation for links under the toctree directive in index.rst
-        f"   {CHAPTERS_SUB_DIR}/{chapter['path_name']}/index" 
+        f"{CHAPTERS_SUB_DIR}/{chapter['path_name']}/index" 
         for chapter in all_chapters
     ])
     
@@ -343,10 +678,13 @@ def update_master_index(root_dir: str, all_chapters: List[Dict[str, Any]]):
         # Read template file
         content = ""
         if index_file_exists:
-            with open(MASTER_INDEX_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+            with open(master_index_template_path, 'r', encoding='utf-8') as f:
                 content = f.read()
+                STATS.file_read(f)
         else:
-            content = f"""
+            print(GENERATED_INCLUDES_EXTENSION)
+            if GENERATED_INCLUDES_EXTENSION == ".rst":
+                content = """
 |project| documentation
 ==================================
 
@@ -356,6 +694,19 @@ def update_master_index(root_dir: str, all_chapters: List[Dict[str, Any]]):
    :caption: Chapters:
 
    <<DYNAMIC_CHAPTER_LINKS>>
+"""
+            else:
+                content = """
+|project| documentation
+==================================
+
+```{toctree}
+:maxdepth: 2
+:numbered:
+:caption: Chapters:
+
+<<DYNAMIC_CHAPTER_LINKS>>
+```
 """
 
         # The substitution must occur after the existing toctree directive in the template.
@@ -365,52 +716,55 @@ def update_master_index(root_dir: str, all_chapters: List[Dict[str, Any]]):
             # We prepend a newline if needed, and substitute the content
             new_content = content.replace(PLACEHOLDER, f"\n{master_toctree_entries}\n")
         else:
-            logger.error(f"❌ Error: Placeholder {PLACEHOLDER} not found in template '{MASTER_INDEX_TEMPLATE_PATH}'. Skipping master index update.")
+            STATS.warn('master_index')
+            logger.error(f"❌ Error: Placeholder {PLACEHOLDER} not found in template '{master_index_template_path}'. Skipping master index update.")
             return
 
-        # Write index file
-        with open(MASTER_INDEX_PATH, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-            
-        logger.verbose(f"✅ Successfully updated master index at {os.path.relpath(MASTER_INDEX_PATH, root_dir)}.")
+        # Write index file, leaving it untouched if nothing changed
+        if write_if_changed(master_index_path, new_content):
+            STATS.count('indices_written')
+            logger.verbose(f"✅ Successfully updated master index at {os.path.relpath(master_index_path, root_dir)}.")
+        else:
+            STATS.count('indices_unchanged')
+            logger.verbose(f"⏩ Master index unchanged at {os.path.relpath(master_index_path, root_dir)}.")
 
     except IOError as e:
+        STATS.warn('master_index')
         logger.error(f"❌ Fatal Error: Could not access or write files: {e}")
 
-
-def generate_combined_includes(root_dir: str):
+def generate_combined_includes(root_dir: str, tree: TreeDirectory):
     """
-    Scans recursively for RST files, reads their ':content_destination:' metadata, and 
-    generates the inclusion list file at the designated location with 
+    Collects the ':content_destination:' metadata of all content files in the tree
+    model and generates the inclusion list file at the designated location with 
     correct relative paths.
     """
 
     combined_files_map = {}
+    VIRTUAL_INCLUDES.clear()
+    PERSISTENT_INCLUDES.clear()
 
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for filename in filenames:
-            # We only look at RST files for the dynamic include feature
-            metadata = None
-            if filename.endswith(GENERATED_INCLUDES_EXTENSION) and filename != 'index.rst':
-                filepath = os.path.join(dirpath, filename)
-                metadata = extract_rst_metadata(filepath)
-            elif filename.endswith(".md") and filename != 'index.md':
-                filepath = os.path.join(dirpath, filename)
-                metadata = extract_md_metadata(filepath)
-
-            if metadata is not None:
-                dest_file_base = metadata.get('destination_file')
-                order = metadata.get('order')
-
-                if dest_file_base:
-                    if dest_file_base not in combined_files_map:
-                        combined_files_map[dest_file_base] = []
-                    
-                    # Store the FULL path to the source content file    
-                    combined_files_map[dest_file_base].append({
-                        'full_path': filepath,
-                        'order': order
-                    })
+    for content_file in iter_files(tree):
+        if content_file.name in ('index.rst', 'index.md'):
+            continue
+
+        dest_file_base = content_file.destination
+        if dest_file_base:
+            if dest_file_base not in combined_files_map:
+                combined_files_map[dest_file_base] = []
+            
+            # Store the FULL path to the source content file    
+            combined_files_map[dest_file_base].append({
+                'full_path': content_file.path,
+                'order': content_file.order
+            })
+
+    if INCLUDE_MODE == PERSISTENT:
+        # Persistent lists whose destination is no longer used by any file
+        for dest_file_base in PREVIOUS_SNAPSHOT['includes'].keys() - combined_files_map.keys():
+            stale_path = os.path.join(root_dir, f"{dest_file_base}{GENERATED_INCLUDES_EXTENSION}")
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+                logger.verbose(f"🗑️ Removed unused inclusion list: {os.path.relpath(stale_path, root_dir)}")
 
     logger.verbose("\n🔨 Generating dynamic include files...")
     if not combined_files_map:
@@ -422,8 +776,26 @@ def generate_combined_includes(root_dir: str):
 
         # Determine the full path of the generated inclusion list file
         output_file_path = os.path.join(root_dir, f"{dest_file_base}{GENERATED_INCLUDES_EXTENSION}")
+        STATS.count('includes_emitted')
 
-        FILES_TO_CLEANUP.append(output_file_path)
+        fragments = [(os.path.relpath(file_data['full_path'], root_dir), file_data['order']) for file_data in files_to_include]
+
+        if INCLUDE_MODE == VIRTUAL:
+            # Included by path relative to the source directory, so the list works from any includer
+            include_directives = [f".. include:: /{path.replace(os.sep, '/')}\n" for path, _ in fragments]
+            VIRTUAL_INCLUDES[os.path.normpath(output_file_path)] = (dest_file_base, "\n".join(include_directives))
+            is_unchanged('includes', dest_file_base, signature(fragments), None)
+            logger.verbose(f"✅ Virtual inclusion list: {os.path.relpath(output_file_path, root_dir)} ({len(files_to_include)} content files)")
+            continue
+
+        if INCLUDE_MODE == PERSISTENT:
+            PERSISTENT_INCLUDES[os.path.normpath(output_file_path)] = [file_data['full_path'] for file_data in files_to_include]
+        else:
+            FILES_TO_CLEANUP.add(output_file_path)
+
+        if is_unchanged('includes', dest_file_base, signature(fragments), output_file_path):
+            logger.verbose(f"⏩ Inclusion list unchanged since last build: {os.path.relpath(output_file_path, root_dir)}")
+            continue
 
         # Ensure the destination directory exists
         os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
@@ -439,59 +811,170 @@ def generate_combined_includes(root_dir: str):
             # Calculate the path from the generated file's location to the source content file
             relative_include_path = os.path.relpath(source_content_path, relative_start_dir)
 
-            include_directives.append(
-                f".. include:: {relative_include_path}\n"
-            )
+            if GENERATED_INCLUDES_EXTENSION == ".rst":
+                include_directives.append(
+                    f".. include:: {relative_include_path}\n"
+                )
+            else:
+                include_directives.append(
+                    "```{include} "
+                    f"{relative_include_path}\n"
+                    "```"
+                )
 
         # Write the list of include directives to the new destination file
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write("\n\n".join(include_directives) + "\n")
+        write_if_changed(output_file_path, "\n\n".join(include_directives) + "\n")
 
         logger.verbose(f"✅ Generated inclusion list: {os.path.relpath(output_file_path, root_dir)} ({len(files_to_include)} content files)")    
 
+def excluded_paths(root_dir: str, patterns: List[str]) -> Callable[[str], bool]:
+    """Returns a function telling whether a path matches one of the Sphinx exclude patterns."""
+    matcher = Matcher(patterns)
+
+    def excluded(path: str) -> bool:
+        return matcher(os.path.relpath(path, root_dir).replace(os.sep, '/'))
+
+    return excluded
+
 def generate_files(app):
     logger.info("Generating dynamic indices and includes")
+    global CHAPTERS_SUB_DIR
+    global MASTER_INDEX_FILE
+    global GENERATED_INCLUDES_EXTENSION
+    global METADATA_CACHE
+    global JOBS
+    global SCAN_WORKERS
+    global PREVIOUS_SNAPSHOT
+    global SNAPSHOT
+    global STATS
+    global ENV_METADATA
+    global INCLUDE_MODE
+    global CHAPTERS_TREE
+
     ROOT_DIR = app.srcdir
     CHAPTERS_SUB_DIR = app.config.dynamic_handling_options.get("chapters_dir", "chapters")
-    MASTER_INDEX_FILE = app.config.dynamic_handling_options.get("master_index_file", None)
+    MASTER_INDEX_FILE = app.config.dynamic_handling_options.get("master_index_file", MASTER_INDEX_FILE)
+    GENERATED_INCLUDES_EXTENSION = app.config.dynamic_handling_options.get("index_extension", ".rst")
+
     CHAPTERS_ROOT = os.path.join(ROOT_DIR, CHAPTERS_SUB_DIR)
+
+    INCLUDE_MODE = app.config.dynamic_handling_options.get("include_mode", TEMPORARY)
+    if INCLUDE_MODE not in INCLUDE_MODES:
+        STATS.warn('options')
+        logger.warning(f"  ⚠️ WARNING: Invalid 'include_mode' value {INCLUDE_MODE!r}. Defaulting to {TEMPORARY}.")
+        INCLUDE_MODE = TEMPORARY
+    elif INCLUDE_MODE == VIRTUAL and GENERATED_INCLUDES_EXTENSION != '.rst':
+        # Markdown includes are handled by MyST, which only reads files
+        logger.verbose(f"⏩ Virtual inclusion lists need the .rst index extension, using {TEMPORARY} files.")
+        INCLUDE_MODE = TEMPORARY
+
+    # Defaults to the value of sphinx-build -j
+    JOBS = resolve_jobs(app.config.dynamic_handling_options.get("jobs"), app.parallel)
+    # Chapter indices can be left to the dynamic-toctree directive
+    write_indices = bool(app.config.dynamic_handling_options.get("write_indices", True))
+    # Number of directory listings and file reads kept in flight, 0 scans sequentially
+    SCAN_WORKERS = resolve_scan_workers(app.config.dynamic_handling_options.get("scan_workers"))
+
+    WRITE_STATS['written'] = 0
+    WRITE_STATS['unchanged'] = 0
+    SKIP_STATS['skipped'] = 0
+    SKIP_STATS['total'] = 0
+    STATS = GenerationStats()
+    SCAN_METADATA.clear()
+    FILES_TO_CLEANUP.clear()
+
+    recorded = getattr(app.env, 'dynamic_handling_metadata', {})
+    ENV_METADATA = {os.path.normpath(os.path.join(ROOT_DIR, entry['path'])): entry for entry in recorded.values()}
+
+    # Only trust the snapshot of the previous build if it was generated with the same settings
+    settings = signature(CHAPTERS_SUB_DIR, MASTER_INDEX_FILE, GENERATED_INCLUDES_EXTENSION, INCLUDE_MODE, write_indices)
+    PREVIOUS_SNAPSHOT = getattr(app.env, 'dynamic_handling_snapshot', None)
+    if not PREVIOUS_SNAPSHOT or PREVIOUS_SNAPSHOT.get('settings') != settings:
+        PREVIOUS_SNAPSHOT = {'settings': None, 'indices': {}, 'includes': {}, 'master': {}, 'outputs': {}}
+    SNAPSHOT = {'settings': settings, 'indices': {}, 'includes': {}, 'master': {}, 'outputs': {}}
+    OUTDATED_INDICES.clear()
+
+    METADATA_CACHE = None
+    if app.config.dynamic_handling_options.get("metadata_cache", True):
+        with STATS.phase('cache'):
+            METADATA_CACHE = MetadataCache(os.path.join(app.doctreedir, CACHE_FILE_NAME), ROOT_DIR, STATS)
+            METADATA_CACHE.load()
     
     logger.verbose(f"▶️ Sphinx Dynamic Chapter Generator Initiated (Root: {ROOT_DIR})")
     
     if not os.path.isdir(CHAPTERS_ROOT):
         logger.error(f"❌ Error: Chapter root directory not found: {CHAPTERS_ROOT}")
         exit(1)
+
+    # Build the tree model of the chapters root in a single pass, indices, include
+    # files and the master index are all emitted from it. Paths matching the
+    # exclude_patterns of conf.py are pruned before anything below them is opened.
+    with STATS.phase('scan'):
+        chapters_tree = scan_tree(CHAPTERS_ROOT, workers=SCAN_WORKERS, exclude=excluded_paths(ROOT_DIR, app.config.exclude_patterns))
+
+    CHAPTERS_TREE = chapters_tree
+    STATS.count('directories_scanned', sum(1 for _ in iter_directories(chapters_tree)))
+
+    with STATS.phase('metadata'):
+        load_tree_metadata(chapters_tree)
+        # Persistent inclusion lists are on disk during the scan, they are not chapter content
+        destinations = {content_file.destination for content_file in iter_files(chapters_tree) if content_file.destination}
+        remove_inclusion_lists(chapters_tree, ROOT_DIR, destinations | PREVIOUS_SNAPSHOT['includes'].keys())
         
     top_level_chapters = []
+    top_level_directories = {}
     
-    # Scan only the top level of the chapters root
-    for item in os.listdir(CHAPTERS_ROOT):
-        full_path = os.path.join(CHAPTERS_ROOT, item)
-        
-        # Only process directories that contain a .chapterconf file
-        if os.path.isdir(full_path):
-            config = read_chapter_config(full_path)
-            if config:
-                top_level_chapters.append({
-                    'path_name': item,
-                    'order': config['order'],
-                    'title': config['title'] or item
-                })
+    # Only the top level directories of the chapters root that contain a .chapterconf file
+    for directory in chapters_tree.directories:
+        if directory.config:
+            top_level_chapters.append({
+                'path_name': directory.name,
+                'order': directory.config['order'],
+                'title': directory.config['title'] or directory.name
+            })
+            top_level_directories[directory.name] = directory
     
     # Sort top-level chapters
     top_level_chapters.sort(key=lambda x: x['order'])
 
     # Process all chapters recursively and generate their index files
-    for chapter in top_level_chapters:
-        chapter_path = os.path.join(CHAPTERS_ROOT, chapter['path_name'])
-        process_directory(ROOT_DIR, chapter_path, chapter['path_name'])
+    with STATS.phase('indices'):
+        if write_indices:
+            for chapter in top_level_chapters:
+                process_directory(ROOT_DIR, top_level_directories[chapter['path_name']])
+        else:
+            logger.verbose("⏩ Chapter index generation disabled, chapters are rendered by dynamic-toctree.")
 
     # Generate the combined inclusion files based on the :content_destination: tag
-    generate_combined_includes(ROOT_DIR)
+    with STATS.phase('includes'):
+        generate_combined_includes(ROOT_DIR, chapters_tree)
         
     # Final step: Update the master index
-    update_master_index(ROOT_DIR, top_level_chapters)
-    
+    with STATS.phase('master'):
+        master_index_path = os.path.join(ROOT_DIR, f"index{GENERATED_INCLUDES_EXTENSION}")
+        if is_unchanged('master', 'index', signature(top_level_chapters), master_index_path):
+            logger.verbose("⏩ Master index inputs unchanged since last build.")
+        else:
+            update_master_index(ROOT_DIR, top_level_chapters)
+
+    app.env.dynamic_handling_snapshot = SNAPSHOT
+
+    if METADATA_CACHE is not None:
+        with STATS.phase('cache'):
+            METADATA_CACHE.save()
+        logger.info(f"Metadata cache: {STATS.counters['metadata_from_env']} from environment, {METADATA_CACHE.hits} reused, {METADATA_CACHE.misses} parsed")
+
+    logger.info(f"Generated files: {WRITE_STATS['written']} written, {WRITE_STATS['unchanged']} unchanged")
+    logger.info(f"Incremental generation: {SKIP_STATS['skipped']} of {SKIP_STATS['total']} generated files skipped, inputs unchanged")
+    logger.info(f"Generation stats: {STATS.summary()}")
+
+    # Optional JSON report for CI dashboards, relative paths are relative to the output directory
+    report_file = app.config.dynamic_handling_options.get("report_file")
+    if report_file:
+        report_path = os.path.join(app.outdir, report_file)
+        STATS.write_report(report_path)
+        logger.verbose(f"📊 Generation report written to {report_path}")
+
     logger.verbose("\n✅ Generator Complete. ")
 
 def cleanup(app, exception):
@@ -502,6 +985,96 @@ def cleanup(app, exception):
             except OSError as e:
                 logger.warning(f"Could not delete generated file {file}")
 
+    # Autobuild processes run many builds in one process
+    FILES_TO_CLEANUP.clear()
+
+def start_profiling(app):
+    """
+    Enables profiling of the generation and cleanup steps if the 'profile' option
+    or the DYNAMIC_HANDLING_PROFILE environment variable (which takes precedence)
+    is set to 'cprofile', 'sampling' or True (sampling if pyinstrument is installed).
+    """
+    global PROFILER
+
+    setting = os.environ.get(PROFILE_ENV_VAR, app.config.dynamic_handling_options.get("profile"))
+    mode = resolve_mode(setting)
+    PROFILER = GenerationProfiler(mode) if mode else None
+
+    if PROFILER is not None:
+        logger.info(f"Profiling dynamic generation with {mode}")
+
+def profiled(handler: Callable) -> Callable:
+    """Wraps an event handler so it runs under the profiler while profiling is enabled."""
+    @functools.wraps(handler)
+    def wrapper(app, *args):
+        if PROFILER is None:
+            return handler(app, *args)
+
+        with PROFILER.profile(handler.__name__):
+            return handler(app, *args)
+
+    return wrapper
+
+def report_profile(app, exception):
+    """Writes the profiles to the output directory and logs the hottest functions."""
+    if PROFILER is None:
+        return
+
+    for path in PROFILER.write(app.outdir):
+        logger.info(f"📈 Profile written to {path}")
+
+    top_count = int(app.config.dynamic_handling_options.get("profile_top", 20))
+    logger.info(f"Top {top_count} functions by self time in dynamic generation and cleanup:")
+    for line in PROFILER.top_functions(top_count):
+        logger.info(line)
+
+def purge_metadata(app, env, docname):
+    for attribute in ('dynamic_handling_metadata', 'dynamic_handling_includes', 'dynamic_handling_toctrees'):
+        if hasattr(env, attribute):
+            getattr(env, attribute).pop(docname, None)
+
+def merge_metadata(app, env, docnames, other):
+    """Merges the metadata, virtual includes and toctree chapters recorded by parallel reader processes."""
+    for attribute in ('dynamic_handling_metadata', 'dynamic_handling_includes', 'dynamic_handling_toctrees'):
+        if not hasattr(env, attribute):
+            setattr(env, attribute, {})
+
+        recorded = getattr(other, attribute, {})
+        for docname in docnames:
+            if docname in recorded:
+                getattr(env, attribute)[docname] = recorded[docname]
+
+def get_outdated(app, env, added, changed, removed) -> List[str]:
+    """
+    Marks exactly the generated indices whose inputs (.chapterconf, children and their
+    metadata) changed as outdated, independent of the modification time of the file,
+    as well as the documents including a virtual inclusion list or rendering a
+    dynamic-toctree of a chapter that changed.
+    """
+    docnames = {docname_of(app.srcdir, index_path) for index_path in OUTDATED_INDICES}
+
+    for docname, includes in getattr(env, 'dynamic_handling_includes', {}).items():
+        if any(PREVIOUS_SNAPSHOT['includes'].get(key) != SNAPSHOT['includes'].get(key) for key in includes):
+            docnames.add(docname)
+
+    signatures = {}
+    for docname, chapters in getattr(env, 'dynamic_handling_toctrees', {}).items():
+        for key, digest in chapters.items():
+            if key not in signatures:
+                directory = CHAPTERS_TREE.find(key) if CHAPTERS_TREE is not None else None
+                signatures[key] = directory_signature(directory) if directory is not None else None
+
+            if signatures[key] != digest:
+                docnames.add(docname)
+
+    outdated = sorted(docname for docname in docnames
+                      if docname in env.all_docs and docname not in added and docname not in changed)
+
+    if outdated:
+        logger.verbose(f"🔁 Generated files with changed inputs: {', '.join(outdated)}")
+
+    return outdated
+
 def setup(app):
     def skip_node(self, node):
         """Standard handler that skips the node and all its children."""
@@ -519,12 +1092,20 @@ def setup(app):
     # Register the directives
     app.add_directive('metadata', MetadataDirective)
     app.add_directive('metadata-end', MetadataEndDirective)
-
-    app.connect('builder-inited', generate_files)
-    app.connect('build-finished', cleanup)
+    app.add_directive('include', DynamicInclude, override=True)
+    app.add_directive('dynamic-toctree', DynamicTocTree)
+
+    # Profiling is set up before and reported after the profiled handlers
+    app.connect('builder-inited', start_profiling, priority=100)
+    app.connect('builder-inited', profiled(generate_files))
+    app.connect('env-get-outdated', get_outdated)
+    app.connect('env-purge-doc', purge_metadata)
+    app.connect('env-merge-info', merge_metadata)
+    app.connect('build-finished', profiled(cleanup))
+    app.connect('build-finished', report_profile, priority=900)
 
     return {
         'version': '1.0',
         'parallel_read_safe': True,
         'parallel_write_safe': True
-    }
\ No newline at end of file
+    }
@@ -1,20 +1,71 @@
 import os
+import json
+import hashlib
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+# Variables exposed by default, extended with env_config_allowlist and env_config_prefixes in conf.py
+DEFAULT_ALLOWLIST = ['BUILD_TYPE']
+DEFAULT_PREFIXES = ['DOCS_']
+
+def filter_environment(environ, allowlist, prefixes):
+    """Returns the environment variables that are allowlisted or start with one of the prefixes."""
+    return {
+        name: value for name, value in environ.items()
+        if name in allowlist or any(name.startswith(prefix) for prefix in prefixes)
+    }
+
+def environment_hash(variables):
+    """Stable hash of the exposed variables, independent of their order."""
+    return hashlib.sha256(json.dumps(variables, sort_keys=True).encode('utf-8')).hexdigest()
+
+def changed_variables(old, new):
+    """Names of the variables that were added, removed or changed between two snapshots."""
+    return sorted(name for name in old.keys() | new.keys() if old.get(name) != new.get(name))
+
+def set_environment(app, config):
+    """
+    Exposes only the allowlisted environment variables as 'env', so unrelated
+    variables (PWD, SHLVL, CI job ids, ...) do not invalidate the environment.
+    """
+    allowlist = set(DEFAULT_ALLOWLIST) | set(config.env_config_allowlist)
+    prefixes = tuple(DEFAULT_PREFIXES) + tuple(config.env_config_prefixes)
+    config.env = filter_environment(os.environ, allowlist, prefixes)
+
+def report_changes(app):
+    """Logs which exposed variables changed since the last build and stores the new snapshot."""
+    env = app.env
+    current = app.config.env
+    current_hash = environment_hash(current)
+    previous_hash = getattr(env, 'env_config_hash', None)
+
+    if previous_hash is not None and previous_hash != current_hash:
+        previous = getattr(env, 'env_config_snapshot', {})
+        logger.info(f"Environment variables changed since the last build: {', '.join(changed_variables(previous, current))}")
+
+    env.env_config_hash = current_hash
+    env.env_config_snapshot = dict(current)
 
 def setup(app):
     """
-    This function registers a 'env' variable containing all environment
+    This function registers a 'env' variable containing the allowlisted environment
     variables, making them accessible via app.config.env in ifconfig.
     """
-    # The 'env' dictionary is a copy of os.environ, converted to a standard dict
-    # and registered as a custom config value.
+    app.add_config_value('env_config_allowlist', [], 'env')
+    app.add_config_value('env_config_prefixes', [], 'env')
+    # The 'env' dictionary is filled in once conf.py has been read
     app.add_config_value(
-        'env', 
-        dict(os.environ), 
-        'env'  # 'env' rebuild type ensures a full rebuild if environment changes
+        'env',
+        {},
+        ''  # Documents reading a changed variable in ifconfig are invalidated by ifconfig_dependencies
     )
-    
+
+    app.connect('config-inited', set_environment)
+    app.connect('builder-inited', report_changes)
+
     return {
         'version': '1.0',
         'parallel_read_safe': True,
         'parallel_write_safe': True,
-    }
\ No newline at end of file
+    }
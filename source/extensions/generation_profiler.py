@@ -0,0 +1,117 @@
+import os
+import pstats
+import cProfile
+import importlib.util
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+CPROFILE = 'cprofile'
+SAMPLING = 'sampling'
+# Sampling interval of the sampling profiler in seconds
+SAMPLING_INTERVAL = 0.001
+
+def resolve_mode(value) -> Optional[str]:
+    """
+    Turns a profile setting into a profiler mode: False/None/'0' disables profiling,
+    'cprofile' or 'sampling' select a profiler, anything else that is true selects
+    the sampling profiler if pyinstrument is installed and cProfile otherwise.
+    """
+    if value is None or value is False or str(value).strip().lower() in ('', '0', 'false', 'no', 'off'):
+        return None
+
+    mode = str(value).strip().lower()
+    if mode in (CPROFILE, SAMPLING):
+        return mode
+
+    return SAMPLING if importlib.util.find_spec('pyinstrument') else CPROFILE
+
+class GenerationProfiler:
+    """
+    Profiles named sections (the generation and cleanup steps) with cProfile or
+    with the pyinstrument sampling profiler. Every section gets its own output
+    file: a .prof file (pstats) for cProfile, a collapsed stack file (as used by
+    flamegraph.pl and speedscope) for the sampling profiler.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        # Section name -> pyinstrument session or cProfile.Profile
+        self.results = {}
+
+    @contextmanager
+    def profile(self, name: str):
+        if self.mode == SAMPLING:
+            from pyinstrument import Profiler # Only needed when sampling
+
+            profiler = Profiler(interval=SAMPLING_INTERVAL)
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                self.results[name] = profiler.last_session
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self.results[name] = profiler
+
+    def write(self, out_dir: str, prefix: str = 'dynamic_handling') -> List[str]:
+        """Writes one profile file per section into out_dir and returns their paths."""
+        os.makedirs(out_dir, exist_ok=True)
+        paths = []
+
+        for name, result in self.results.items():
+            if self.mode == SAMPLING:
+                path = os.path.join(out_dir, f"{prefix}_{name}.collapsed")
+                with open(path, 'w', encoding='utf-8') as f:
+                    for stack, seconds in collapsed_stacks(result.root_frame()):
+                        f.write(f"{stack} {round(seconds * 1000000)}\n")
+            else:
+                path = os.path.join(out_dir, f"{prefix}_{name}.prof")
+                result.dump_stats(path)
+
+            paths.append(path)
+
+        return paths
+
+    def top_functions(self, count: int) -> List[str]:
+        """Returns report lines for the count functions with the most self time over all sections."""
+        self_times = {}
+
+        for result in self.results.values():
+            if self.mode == SAMPLING:
+                for stack, seconds in collapsed_stacks(result.root_frame()):
+                    label = stack.rsplit(';', 1)[-1]
+                    self_times[label] = self_times.get(label, 0.0) + seconds
+            else:
+                for (file_name, line, function), (_, _, self_time, _, _) in pstats.Stats(result).stats.items():
+                    label = f"{function} ({os.path.basename(file_name)}:{line})"
+                    self_times[label] = self_times.get(label, 0.0) + self_time
+
+        hottest = sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [f"{seconds * 1000:10.1f} ms  {label}" for label, seconds in hottest]
+
+def collapsed_stacks(root_frame) -> List[Tuple[str, float]]:
+    """Folds the frame tree of a pyinstrument session into ('a;b;c', self seconds) pairs."""
+    stacks = []
+    if root_frame is None:
+        return stacks
+
+    pending = [(root_frame, '')]
+    while pending:
+        frame, parent_stack = pending.pop()
+        label = f"{frame.function} ({frame.file_path_short}:{frame.line_no})".replace(';', ',')
+        stack = f"{parent_stack};{label}" if parent_stack else label
+
+        children = [child for child in frame.children if not child.is_synthetic]
+        self_time = frame.time - sum(child.time for child in children)
+        if self_time > 0:
+            stacks.append((stack, self_time))
+
+        pending.extend((child, stack) for child in children)
+
+    return stacks
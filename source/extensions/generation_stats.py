@@ -0,0 +1,80 @@
+import os
+import json
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, IO
+
+# Always present in the report, so dashboards see a 0 instead of a missing key
+COUNTERS = (
+    'directories_scanned', 'files_opened', 'bytes_read', 'yaml_parses', 'metadata_from_env',
+    'indices_written', 'indices_unchanged', 'indices_skipped',
+    'includes_emitted', 'includes_skipped'
+)
+
+class GenerationStats:
+    """
+    Phase timers and counters of one generation run (directories scanned, files
+    opened, bytes read, YAML parses, generated files and warnings by category).
+    count() and warn() may be called from several threads.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = Counter({name: 0 for name in COUNTERS})
+        self.warnings = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def file_read(self, f: IO):
+        """Counts an opened file and the bytes read from it so far, call before closing it."""
+        raw = getattr(f, 'buffer', f)
+        raw = getattr(raw, 'raw', raw)
+        self.count('files_opened')
+        self.count('bytes_read', raw.tell())
+
+    def warn(self, category: str):
+        with self._lock:
+            self.warnings[category] += 1
+
+    @contextmanager
+    def phase(self, name: str):
+        """Adds the time spent in the with block to the timer of phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'total': round(sum(self.timings.values()), 6),
+            'counters': dict(self.counters),
+            'warnings': dict(self.warnings)
+        }
+
+    def summary(self) -> str:
+        """One line summary for the build log."""
+        timings = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.timings.items())
+        counters = self.counters
+        warnings = ", ".join(f"{category}={count}" for category, count in sorted(self.warnings.items())) or "none"
+
+        return (
+            f"{sum(self.timings.values()):.3f}s ({timings}); "
+            f"{counters['directories_scanned']} dirs, {counters['files_opened']} files opened, "
+            f"{counters['bytes_read'] / 1024:.1f} KiB read, {counters['yaml_parses']} YAML parses; "
+            f"indices {counters['indices_written']} written, {counters['indices_unchanged']} unchanged, "
+            f"{counters['indices_skipped']} skipped; {counters['includes_emitted']} include files; "
+            f"warnings: {warnings}"
+        )
+
+    def write_report(self, report_path: str):
+        """Writes the timers and counters as JSON."""
+        os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
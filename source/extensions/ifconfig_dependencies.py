@@ -0,0 +1,134 @@
+import ast
+from sphinx.ext.ifconfig import ifconfig
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+# Stands for the whole 'env' dictionary when an expression uses it in a way that
+# does not name a single variable, e.g. iterating over it
+ALL_VARIABLES = '*'
+
+def expression_dependencies(expression, config_names):
+    """
+    Returns the config names and the 'env' keys an ifconfig expression reads.
+    env['NAME'], env.get('NAME') and 'NAME' in env name a single key, any
+    other use of env depends on all variables.
+    """
+    names = set()
+    env_keys = set()
+
+    tree = ast.parse(expression, mode='eval')
+    parents = {child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)}
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Name) or node.id not in config_names:
+            continue
+
+        names.add(node.id)
+        if node.id != 'env':
+            continue
+
+        parent = parents.get(node)
+        key = None
+        if isinstance(parent, ast.Subscript) and parent.value is node:
+            key = parent.slice
+        elif isinstance(parent, ast.Attribute) and parent.attr == 'get' and isinstance(parents.get(parent), ast.Call):
+            arguments = parents[parent].args
+            key = arguments[0] if arguments else None
+        elif isinstance(parent, ast.Compare) and len(parent.ops) == 1 and isinstance(parent.ops[0], (ast.In, ast.NotIn)) \
+                and parent.comparators[0] is node:
+            key = parent.left
+
+        if isinstance(key, ast.Constant) and isinstance(key.value, str):
+            env_keys.add(key.value)
+        else:
+            env_keys.add(ALL_VARIABLES)
+
+    names.discard('env')
+    return names, env_keys
+
+def current_values(config, names, env_keys):
+    """The values the dependencies of a document have in this build."""
+    env = getattr(config, 'env', {}) or {}
+    return {
+        'config': {name: getattr(config, name, None) for name in names},
+        'env': dict(env) if ALL_VARIABLES in env_keys else {key: env.get(key) for key in env_keys}
+    }
+
+def record_dependencies(app, doctree):
+    """Records which config values and environment variables the ifconfig expressions of the document read."""
+    config_names = {confval.name for confval in app.config}
+    names = set()
+    env_keys = set()
+
+    for node in doctree.findall(ifconfig):
+        try:
+            node_names, node_env_keys = expression_dependencies(node['expr'], config_names)
+        except SyntaxError:
+            # Reported by sphinx.ext.ifconfig when the expression is evaluated
+            continue
+
+        names |= node_names
+        env_keys |= node_env_keys
+
+    env = app.env
+    if not hasattr(env, 'ifconfig_dependencies'):
+        env.ifconfig_dependencies = {}
+
+    if names or env_keys:
+        env.ifconfig_dependencies[env.docname] = {
+            'names': sorted(names),
+            'env_keys': sorted(env_keys),
+            'values': current_values(app.config, names, env_keys)
+        }
+    else:
+        env.ifconfig_dependencies.pop(env.docname, None)
+
+def purge_dependencies(app, env, docname):
+    if hasattr(env, 'ifconfig_dependencies'):
+        env.ifconfig_dependencies.pop(docname, None)
+
+def merge_dependencies(app, env, docnames, other):
+    """Merges the dependencies recorded by parallel reader processes."""
+    if not hasattr(env, 'ifconfig_dependencies'):
+        env.ifconfig_dependencies = {}
+
+    recorded = getattr(other, 'ifconfig_dependencies', {})
+    for docname in docnames:
+        if docname in recorded:
+            env.ifconfig_dependencies[docname] = recorded[docname]
+
+def get_outdated(app, env, added, changed, removed):
+    """Returns the documents whose ifconfig expressions read a value that changed since they were read."""
+    outdated = []
+
+    for docname, recorded in getattr(env, 'ifconfig_dependencies', {}).items():
+        if docname in added or docname in changed or docname not in env.all_docs:
+            continue
+
+        if current_values(app.config, recorded['names'], recorded['env_keys']) != recorded['values']:
+            outdated.append(docname)
+
+    if outdated:
+        logger.info(f"ifconfig values changed, reading again: {', '.join(sorted(outdated))}")
+
+    return outdated
+
+def setup(app):
+    """
+    Invalidates only the documents whose ifconfig expressions read a changed
+    config value or environment variable. The config values used in ifconfig
+    expressions can therefore be registered with rebuild type ''.
+    """
+    app.setup_extension('sphinx.ext.ifconfig')
+
+    app.connect('doctree-read', record_dependencies)
+    app.connect('env-purge-doc', purge_dependencies)
+    app.connect('env-merge-info', merge_dependencies)
+    app.connect('env-get-outdated', get_outdated)
+
+    return {
+        'version': '1.0',
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
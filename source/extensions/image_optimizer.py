@@ -0,0 +1,249 @@
+import os
+import json
+import hashlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from sphinx.util import logging
+from sphinx.util.osutil import copyfile, ensuredir
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = 'image_optimizer_index.json'
+CACHE_DIR_NAME = 'optimized_images'
+CHUNK_SIZE = 1024 * 1024
+
+# File extensions of the images that are optimized, by Pillow format
+IMAGE_FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP'}
+
+DEFAULT_SETTINGS = {
+    'max_width': None,
+    'max_height': None,
+    'quality': 85,
+    'strip_metadata': True
+}
+
+def pillow_available() -> bool:
+    return importlib.util.find_spec('PIL') is not None
+
+def resolve_settings(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Fills in the defaults for the settings that are not configured, 'workers' is not a setting."""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update({name: value for name, value in options.items() if name in DEFAULT_SETTINGS})
+    return settings
+
+def is_image(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in IMAGE_FORMATS
+
+def cache_key(source_hash: str, settings: Dict[str, Any]) -> str:
+    """Identifies the optimized version of an image, changes with its content and the settings."""
+    return hashlib.sha256(f"{source_hash}:{json.dumps(settings, sort_keys=True)}".encode('utf-8')).hexdigest()
+
+def optimize_image(source: str, destination: str, settings: Dict[str, Any]) -> Tuple[int, int, Optional[str]]:
+    """
+    Recompresses source into destination, downsized to fit the maximum dimensions and
+    without EXIF/ICC metadata if strip_metadata is set. The source is used as it is
+    if the result would not be smaller. Returns the sizes of source and destination,
+    and the error if the image could not be optimized.
+    """
+    temporary_path = f"{destination}.{os.getpid()}.tmp"
+    try:
+        return write_optimized_image(source, destination, temporary_path, settings) + (None,)
+    except Exception as e:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return 0, 0, f"{type(e).__name__}: {e}"
+
+def write_optimized_image(source: str, destination: str, temporary_path: str, settings: Dict[str, Any]) -> Tuple[int, int]:
+    from PIL import Image, ImageOps # Only needed when images are optimized
+
+    image_format = IMAGE_FORMATS[os.path.splitext(source)[1].lower()]
+    resized = False
+
+    with Image.open(source) as original:
+        info = original.info
+        # Applies the EXIF orientation, which is lost when the metadata is stripped
+        image = ImageOps.exif_transpose(original)
+
+        max_width = settings['max_width'] or image.width
+        max_height = settings['max_height'] or image.height
+        if image.width > max_width or image.height > max_height:
+            image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            resized = True
+
+        save_options = {'optimize': True}
+        if image_format in ('JPEG', 'WEBP'):
+            save_options['quality'] = settings['quality']
+        if image_format == 'JPEG':
+            save_options['progressive'] = True
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+        if not settings['strip_metadata']:
+            for name in ('exif', 'icc_profile'):
+                if info.get(name):
+                    save_options[name] = info[name]
+
+        image.save(temporary_path, image_format, **save_options)
+
+    source_size = os.path.getsize(source)
+    if not resized and os.path.getsize(temporary_path) >= source_size:
+        os.remove(temporary_path)
+        with open(source, 'rb') as f, open(temporary_path, 'wb') as out:
+            out.write(f.read())
+
+    os.replace(temporary_path, destination)
+    return source_size, os.path.getsize(destination)
+
+def optimize_images(jobs: List[Tuple[str, str]], settings: Dict[str, Any], workers: int) -> List[Tuple[int, int, Optional[str]]]:
+    """
+    Optimizes the (source, destination) jobs, in a process pool when there is more than
+    one job and worker. Returns the result of optimize_image per job.
+    """
+    if workers > 1 and len(jobs) > 1:
+        sources, destinations = zip(*jobs)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(optimize_image, sources, destinations, [settings] * len(jobs)))
+
+    return [optimize_image(source, destination, settings) for source, destination in jobs]
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_index(index_path: str) -> Dict[str, Dict]:
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def optimized_versions(app, sources: List[str], options: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Returns the cached optimized version of every image in sources (relative to the
+    source directory). Images whose content or the settings changed since they were
+    last optimized are processed first, in a process pool. Images that could not be
+    optimized are left out and not tried again until they change.
+
+    The index in the doctree directory keeps the content hash of every image (reused
+    while its stat data is unchanged) and its cache key. Entries of images no longer
+    used by any document and cached versions no longer referenced are removed.
+    """
+    settings = resolve_settings(options)
+    workers = options.get('workers') or os.cpu_count() or 1
+    cache_dir = os.path.join(app.doctreedir, CACHE_DIR_NAME)
+    index_path = os.path.join(app.doctreedir, INDEX_FILE_NAME)
+    ensuredir(cache_dir)
+
+    index = {source: entry for source, entry in load_index(index_path).items() if source in app.env.images}
+    versions = {}
+    jobs = {}
+
+    for source in sources:
+        source_path = os.path.join(app.srcdir, source)
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            # Reported by the builder when it copies the image
+            continue
+
+        stat = [st.st_size, st.st_mtime_ns]
+        entry = index.get(source)
+        if entry is None or entry['stat'] != stat:
+            entry = index[source] = {'stat': stat, 'hash': file_hash(source_path)}
+
+        key = cache_key(entry['hash'], settings)
+        if entry.get('failed') == key:
+            continue
+
+        entry['key'] = key
+        versions[source] = os.path.join(cache_dir, key + os.path.splitext(source)[1].lower())
+        if not os.path.exists(versions[source]):
+            jobs.setdefault(versions[source], source_path)
+
+    results = optimize_images([(source_path, version) for version, source_path in jobs.items()], settings, workers)
+    failed = set()
+    for (version, source_path), (_, _, error) in zip(jobs.items(), results):
+        if error is not None:
+            failed.add(version)
+            logger.warning(f"Could not optimize {os.path.relpath(source_path, app.srcdir)}, using it as it is: {error}")
+
+    for source, version in list(versions.items()):
+        if version in failed:
+            index[source]['failed'] = index[source].pop('key')
+            del versions[source]
+
+    used = {entry['key'] for entry in index.values() if 'key' in entry}
+    for filename in os.listdir(cache_dir):
+        if os.path.splitext(filename)[0] not in used:
+            os.remove(os.path.join(cache_dir, filename))
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+
+    if jobs:
+        logger.info(f"Image optimization: {len(jobs) - len(failed)} images optimized, {len(failed)} failed")
+
+    return versions
+
+def install_image_optimization(app):
+    """
+    Makes the HTML builder copy the optimized versions of the images used by the
+    documents into _images instead of the originals. The builder copies the images
+    of the documents written in this build; other files are copied as usual.
+    """
+    options = app.config.image_optimization
+    if not options or app.builder.format != 'html':
+        return
+
+    if not pillow_available():
+        logger.warning("image_optimization is set but Pillow is not installed, images are copied as they are")
+        return
+
+    builder = app.builder
+    copy_image_files = builder.copy_image_files
+
+    def copy_optimized_image_files():
+        images = builder.images
+        versions = optimized_versions(app, [source for source in images if is_image(source)], options)
+
+        # The builder copies everything that has no optimized version
+        builder.images = {source: name for source, name in images.items() if source not in versions}
+        try:
+            copy_image_files()
+        finally:
+            builder.images = images
+
+        images_dir = os.path.join(builder.outdir, builder.imagedir)
+        ensuredir(images_dir)
+        source_size = shipped_size = 0
+        for source, version in versions.items():
+            # No-op if the destination already holds the same optimized version
+            copyfile(version, os.path.join(images_dir, images[source]), force=True)
+            source_size += os.path.getsize(os.path.join(app.srcdir, source))
+            shipped_size += os.path.getsize(version)
+
+        if versions:
+            logger.info(f"Images in {builder.imagedir}: {len(versions)} optimized, "
+                        f"{(source_size - shipped_size) // 1024} KiB smaller than the originals")
+
+    builder.copy_image_files = copy_optimized_image_files
+
+def setup(app):
+    """
+    Registers the optional image optimization stage: with 'image_optimization' set
+    (a dict of the DEFAULT_SETTINGS to change and 'workers'), the JPEG, PNG and WebP
+    images used by the documents are recompressed, stripped of their metadata and
+    downsized before the HTML builder copies them into _images. Requires Pillow.
+    """
+    # Changed settings need the images of every document copied again
+    app.add_config_value('image_optimization', None, 'html')
+    app.connect('builder-inited', install_image_optimization)
+
+    return {
+        'version': '1.0',
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
@@ -0,0 +1,128 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Callable, Dict, Any, Optional
+
+# Bumped whenever the metadata extracted from a file can change, so entries written
+# by an older parser are dropped (2: streaming metadata_parser instead of regex/YAML)
+CACHE_VERSION = 2
+
+class MetadataCache:
+    """
+    Persistent cache of the metadata parsed from content files.
+
+    Entries are keyed by the path relative to the root directory and validated
+    against (size, mtime_ns, inode) of the file. If the stat data no longer matches
+    (e.g. on a fresh checkout) the content hash is compared before falling back to
+    parsing the file again. Entries for files that were not seen during a run are
+    evicted when the cache is saved. get() may be called from several threads.
+    Files read for validation are counted in stats (a GenerationStats) if given.
+    """
+
+    def __init__(self, cache_path: str, root_dir: str, stats=None):
+        self.cache_path = cache_path
+        self.root_dir = root_dir
+        self.stats = stats
+        self.entries = {}
+        self.seen = set()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Loads the cache file, starting with an empty cache if it is missing or stale."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') == CACHE_VERSION and isinstance(data.get('entries'), dict):
+            self.entries = data['entries']
+
+    def get(self, filepath: str, extract: Callable[..., Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Returns the metadata for filepath, only calling extract if the file changed.
+        The content read for hashing is passed to extract as text, so a changed file
+        is read once.
+        """
+        key = os.path.relpath(filepath, self.root_dir)
+        with self._lock:
+            self.seen.add(key)
+
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return extract(filepath)
+
+        file_stat = [st.st_size, st.st_mtime_ns, st.st_ino]
+        entry = self.entries.get(key)
+
+        if entry and entry['stat'] == file_stat:
+            with self._lock:
+                self.hits += 1
+            return dict(entry['metadata'])
+
+        content = self._read_file(filepath, self.stats)
+        digest = hashlib.sha256(content).hexdigest() if content is not None else None
+        if entry and digest and entry['sha256'] == digest:
+            # Same content with new stat data, e.g. after a fresh checkout
+            with self._lock:
+                entry['stat'] = file_stat
+                self.dirty = True
+                self.hits += 1
+            return dict(entry['metadata'])
+
+        try:
+            text = content.decode('utf-8') if content is not None else None
+        except UnicodeDecodeError:
+            # Left to extract, which reports the file
+            text = None
+
+        metadata = extract(filepath, text) if text is not None else extract(filepath)
+        with self._lock:
+            self.misses += 1
+            self.entries[key] = {
+                'stat': file_stat,
+                'sha256': digest,
+                'metadata': dict(metadata)
+            }
+            self.dirty = True
+
+        return metadata
+
+    def keep(self, filepath: str):
+        """Keeps the entry of a file whose metadata was taken from elsewhere from being evicted."""
+        with self._lock:
+            self.seen.add(os.path.relpath(filepath, self.root_dir))
+
+    def save(self):
+        """Evicts entries of files no longer present and writes the cache if it changed."""
+        for key in list(self.entries):
+            if key not in self.seen:
+                del self.entries[key]
+                self.dirty = True
+
+        if not self.dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.cache_path)
+
+        self.dirty = False
+
+    @staticmethod
+    def _read_file(filepath: str, stats=None) -> Optional[bytes]:
+        try:
+            with open(filepath, 'rb') as f:
+                content = f.read()
+                if stats is not None:
+                    stats.file_read(f)
+                return content
+        except OSError:
+            return None
@@ -0,0 +1,149 @@
+import io
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# The supported metadata block syntaxes
+RST_DIRECTIVE = 'rst'        # .. metadata:: followed by an indented field list
+FRONT_MATTER = 'front_matter' # --- YAML front matter --- at the start of the file
+FENCE = 'fence'              # ```{metadata} fenced block
+ALL_SYNTAXES = (RST_DIRECTIVE, FRONT_MATTER, FENCE)
+
+# A metadata block has to start within this many characters of the file,
+# once started it is read until it ends regardless of its length
+HEAD_CHARS = 1000
+
+RST_DIRECTIVE_PATTERN = re.compile(r'^\.\.\s*metadata::\s*$')
+SIMPLE_FIELD_PATTERN = re.compile(r'^(:?[A-Za-z_][\w-]*):(?:[ \t]+(.*?))?[ \t]*$')
+INT_PATTERN = re.compile(r'[-+]?(?:0|[1-9][0-9]*)')
+
+# Plain scalars that YAML would not load as a string
+YAML_SPECIAL_SCALARS = {
+    'y', 'n', 'yes', 'no', 'on', 'off', 'true', 'false', 'null', '~',
+    '.inf', '-.inf', '+.inf', '.nan'
+}
+YAML_INDICATORS = '\'"[]{}|>&*!%@`#,?-:'
+# Marker returned for values that need the YAML fallback
+_COMPLEX = object()
+
+def read_metadata_block(filepath: str, syntaxes: Iterable[str] = ALL_SYNTAXES, head_chars: int = HEAD_CHARS, stats=None,
+                        text: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Reads the file line by line until the end of the first metadata block in one of
+    the given syntaxes and returns its parsed fields (without leading ':'), or None
+    if no block starts within the first head_chars characters. The opened file,
+    bytes read and YAML parses are counted in stats (a GenerationStats) if given.
+    If the content of the file was already read by the caller it is passed as text
+    and the file is not opened again.
+    """
+    if text is not None:
+        block = find_block(io.StringIO(text, newline=None), tuple(syntaxes), head_chars)
+    else:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            block = find_block(f, tuple(syntaxes), head_chars)
+            if stats is not None:
+                stats.file_read(f)
+
+    if block is None:
+        return None
+
+    return parse_block(block, stats)
+
+def find_block(lines: Iterable[str], syntaxes: Tuple[str, ...], head_chars: int = HEAD_CHARS) -> Optional[List[str]]:
+    """Returns the content lines of the first metadata block, consuming no lines past its end."""
+    consumed = 0
+    first_line = True
+    lines = iter(lines)
+
+    for line in lines:
+        if first_line and FRONT_MATTER in syntaxes and line.rstrip() == '---':
+            return _collect_until(lines, lambda l: l.startswith('---'))
+        first_line = False
+
+        stripped = line.lstrip()
+        if FENCE in syntaxes and stripped.startswith('```{metadata}') and not stripped[13:].strip():
+            return _collect_until(lines, lambda l: l.lstrip().startswith('```'))
+
+        if RST_DIRECTIVE in syntaxes and RST_DIRECTIVE_PATTERN.match(line):
+            return _collect_rst_body(lines)
+
+        consumed += len(line)
+        if consumed >= head_chars:
+            return None
+
+    return None
+
+def _collect_until(lines: Iterable[str], is_end) -> Optional[List[str]]:
+    block = []
+    for line in lines:
+        if is_end(line):
+            return block
+        block.append(line.rstrip('\n'))
+
+    # Unterminated blocks are not metadata
+    return None
+
+def _collect_rst_body(lines: Iterable[str]) -> List[str]:
+    # The directive body ends at the first line that starts with a non whitespace character
+    block = []
+    for line in lines:
+        if line[:1].strip():
+            break
+        block.append(line.rstrip('\n'))
+
+    while block and not block[-1].strip():
+        block.pop()
+
+    return block
+
+def parse_block(block: List[str], stats=None) -> Dict[str, Any]:
+    """
+    Parses the lines of a metadata block. Simple 'key: value' and ':key: value' fields
+    are parsed directly, anything else falls back to a (C accelerated if available) YAML loader.
+    """
+    content_lines = [line for line in block if line.strip()]
+    if not content_lines:
+        return {}
+
+    first_line = content_lines[0]
+    indent = first_line[:len(first_line) - len(first_line.lstrip())]
+
+    data = {}
+    for line in content_lines:
+        match = SIMPLE_FIELD_PATTERN.match(line[len(indent):]) if line.startswith(indent) else None
+        value = _simple_scalar(match.group(2)) if match else _COMPLEX
+
+        if value is _COMPLEX:
+            if stats is not None:
+                stats.count('yaml_parses')
+            return _parse_yaml("\n".join(line[len(indent):] if line.startswith(indent) else line for line in block))
+
+        data[match.group(1).lstrip(':')] = value
+
+    return data
+
+def _simple_scalar(raw: Optional[str]) -> Any:
+    """Converts a plain scalar the way YAML would, or returns _COMPLEX if unsure."""
+    if not raw:
+        return None
+
+    if INT_PATTERN.fullmatch(raw):
+        return int(raw)
+
+    if raw[0] in YAML_INDICATORS or raw[0].isdigit() or raw[0] in '+.':
+        return _COMPLEX
+
+    if '\t' in raw or ' #' in raw or ': ' in raw or raw.endswith(':') or raw.lower() in YAML_SPECIAL_SCALARS:
+        return _COMPLEX
+
+    return raw
+
+def _parse_yaml(text: str) -> Dict[str, Any]:
+    import yaml # Only needed for complex metadata values
+
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    data = yaml.load(text, Loader=loader) or {}
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Metadata block is not a mapping: {data!r}")
+
+    return {str(key).lstrip(':'): value for key, value in data.items()}
@@ -0,0 +1,117 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, List, Optional
+from sphinx.util.matching import Matcher
+
+# Folder names treated as static asset directories
+STATIC_FOLDER_NAMES = ['images', 'assets']
+# Folders that never contain chapter assets
+BUILD_DIR_NAMES = ('_build', '_temp', 'build', '__pycache__')
+# Files marking a Sphinx output or doctree directory
+BUILD_MARKERS = ('.buildinfo', 'environment.pickle')
+CACHE_VERSION = 1
+
+def default_cache_path(chapters_root: str) -> str:
+    """Cache file in the temporary directory, one per chapters root."""
+    digest = hashlib.sha1(os.path.abspath(chapters_root).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"sphinx_static_paths_{digest}.json")
+
+def walk_static_paths(conf_dir: str, chapters_root: str, folder_names: List[str], exclude_patterns: List[str]):
+    """
+    Walks the chapters root and returns the static folders (relative to conf_dir) and
+    the modification time of every directory visited. Hidden, build and excluded
+    directories are pruned without being listed.
+    """
+    excluded = Matcher(exclude_patterns)
+    static_paths = []
+    directories = {}
+    pending = [chapters_root]
+
+    while pending:
+        path = pending.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+            directories[os.path.relpath(path, conf_dir)] = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+
+        if any(entry.name in BUILD_MARKERS for entry in entries):
+            continue
+
+        for entry in entries:
+            if not entry.is_dir() or entry.name.startswith('.') or entry.name in BUILD_DIR_NAMES:
+                continue
+
+            relative_path = os.path.relpath(entry.path, conf_dir)
+            if excluded(relative_path.replace(os.sep, '/')):
+                continue
+
+            if entry.name in folder_names:
+                static_paths.append(relative_path)
+            pending.append(entry.path)
+
+    return sorted(static_paths), directories
+
+def read_cache(cache_path: str, key: Dict) -> Optional[List[str]]:
+    """Returns the cached static paths if the settings match and no visited directory changed."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cache.get('key') != key:
+        return None
+
+    conf_dir = key['conf_dir']
+    for relative_path, mtime in cache['directories'].items():
+        try:
+            if os.stat(os.path.join(conf_dir, relative_path)).st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+
+    return cache['paths']
+
+def write_cache(cache_path: str, key: Dict, paths: List[str], directories: Dict[str, int]):
+    # Written to a temporary file first, parallel builds may read the cache at the same time
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'paths': paths, 'directories': directories}, f)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        # The cache is only an optimization
+        pass
+
+def find_static_paths(conf_dir: str, chapters_dir: str = 'chapters', folder_names: Optional[List[str]] = None,
+                      exclude_patterns: Optional[List[str]] = None, cache_path: Optional[str] = None) -> List[str]:
+    """
+    Returns the asset folders (named like one of folder_names) below the chapters root,
+    relative to conf_dir as required by html_static_path. The result is cached and only
+    walked again when a directory below the chapters root was added, removed or renamed,
+    which shows in the modification time of the directories visited last time.
+    """
+    conf_dir = os.path.abspath(conf_dir)
+    chapters_root = os.path.join(conf_dir, chapters_dir)
+    folder_names = list(folder_names or STATIC_FOLDER_NAMES)
+    exclude_patterns = list(exclude_patterns or [])
+    cache_path = cache_path or default_cache_path(chapters_root)
+
+    key = {
+        'version': CACHE_VERSION,
+        'conf_dir': conf_dir,
+        'chapters_dir': chapters_dir,
+        'folder_names': folder_names,
+        'exclude_patterns': exclude_patterns
+    }
+
+    paths = read_cache(cache_path, key)
+    if paths is None:
+        paths, directories = walk_static_paths(conf_dir, chapters_root, folder_names, exclude_patterns)
+        write_cache(cache_path, key, paths, directories)
+
+    return paths